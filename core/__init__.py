@@ -2,6 +2,13 @@
 core package - AI-powered test automation components
 """
 
-from .ai_healer import AIHealer
-
 __all__ = ["AIHealer"]
+
+
+def __getattr__(name):
+    # AIHealer pulls in the AI gateway and provider SDKs - import on first use
+    # so `core.smart_locator` / `core.vision_analyzer` stay cheap to import
+    if name == "AIHealer":
+        from .ai_healer import AIHealer
+        return AIHealer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -17,13 +17,122 @@ OPTIMIZATIONS (Enterprise-Grade):
 
 import os
 import json
+import atexit
+import logging
 import datetime
+import hashlib
 import time
 import re
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
 from playwright.sync_api import Page
 from services.locator_repair.ai_gateway import AIGateway
 
+# Optional: orjson reads/writes the cache and log in C (stdlib json otherwise)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Optional: xxHash (XXH3) for page/screenshot content digests - a non-cryptographic
+# SIMD hash is plenty for cache keys (stdlib hashlib otherwise)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Diagnostics go through logging (lazy %-formatting, silent unless enabled:
+# pytest -o log_cli=true -o log_cli_level=INFO); warnings still reach stderr
+logger = logging.getLogger(__name__)
+
+# Healed locators are written to the cache file at most this often
+# (plus on flush() / interpreter exit) instead of after every heal
+CACHE_FLUSH_INTERVAL_S = 5.0
+
+# Healing log lines are buffered in memory and written out when the buffer
+# fills, when this much time has passed, or on flush() / stats reads
+LOG_BUFFER_BYTES = 64 * 1024
+LOG_FLUSH_INTERVAL_S = 1.0
+
+# First block read from the end of the log by show_recent_healings()
+LOG_TAIL_BLOCK_BYTES = 16 * 1024
+
+# (framework, failed_locator, context_hint)
+CacheKey = Tuple[str, str, str]
+
+# AI answers remembered per (page HTML digest, locator, hint) across frameworks
+PAGE_ANSWER_CACHE_MAX_ITEMS = 256
+
+# Characters of page HTML sent in the healing prompt
+PROMPT_HTML_CHARS = 4000
+
+
+# Low-cardinality log fields interned when the log is parsed
+_INTERNED_LOG_FIELDS = ("engine", "healing_source")
+
+
+def _intern_key(framework: str, locator: str, hint: str) -> CacheKey:
+    """Cache key with the repeated framework / hint strings interned."""
+    return (sys.intern(framework), locator, sys.intern(hint))
+
+
+def _legacy_cache_key(key: str) -> CacheKey:
+    """
+    Split an old "framework:locator:hint" cache key.
+    
+    The framework never contains ':' but CSS locators often do
+    (e.g. "button:has-text('Login')"), so the hint is taken after the last ':'.
+    """
+    framework, _, rest = key.partition(":")
+    locator, _, hint = rest.rpartition(":")
+    return _intern_key(framework, locator, hint)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Compact UTF-8 JSON (orjson if installed)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _parse_log(content: bytes) -> list:
+    """
+    Healing records from log file content.
+    
+    JSON Lines, optionally preceded by a legacy JSON array (logs written
+    before the switch to append-only lines); unparsable lines are skipped.
+    """
+    text = content.decode("utf-8", errors="replace").lstrip()
+    entries = []
+    if text.startswith("["):
+        try:
+            legacy, end = json.JSONDecoder().raw_decode(text)
+            entries.extend(legacy)
+            text = text[end:]
+        except ValueError:
+            pass
+    
+    for line in text.splitlines():
+        if line.strip():
+            try:
+                entries.append(_json_loads(line))
+            except ValueError:
+                continue
+    
+    # A handful of engines/sources repeat on every record: share one string each
+    for entry in entries:
+        for field in _INTERNED_LOG_FIELDS:
+            value = entry.get(field)
+            if type(value) is str:
+                entry[field] = sys.intern(value)
+    return entries
+
 
 class AIHealer:
     """
@@ -73,24 +182,40 @@ class AIHealer:
             try:
                 from core.vision_analyzer import VisionAnalyzer
                 self.vision_analyzer = VisionAnalyzer(ai_gateway=self.ai)
-                print("[AI-Healer] 👁️ Vision fallback enabled")
+                logger.info("[AI-Healer] 👁️ Vision fallback enabled")
             except Exception as e:
-                print(f"[AI-Healer] ⚠️ Vision fallback disabled: {e}")
+                logger.warning("[AI-Healer] ⚠️ Vision fallback disabled: %s", e)
         
         # Initialize cache dictionary
-        self.cache: Dict[str, str] = {}
+        self.cache: Dict[CacheKey, str] = {}
+        self._cache_dirty = False
+        self._last_cache_flush = time.monotonic()
+        
+        # In-memory AI answers keyed by prompt HTML, shared by all frameworks
+        self._page_answers: Dict[Tuple[str, str, str], str] = {}
+        
+        # Log file handle kept open between healings (opened on first event)
+        self._log_file = None
+        self._last_log_flush = time.monotonic()
         
         # Ensure directories exist
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
         os.makedirs(os.path.dirname(cache_path), exist_ok=True)
         
-        # Initialize log file
-        if not os.path.exists(log_path):
-            with open(log_path, "w") as f:
-                json.dump([], f)
+        # Initialize log file (JSON Lines; older JSON-array logs are converted)
+        self._init_log()
+        
+        # Running totals behind get_healing_stats(); records already in the log
+        # (the first _stats_backlog_bytes) are folded in on the first stats call
+        self._stats = {"total": 0, "by_source": Counter(), "latency_sum_ms": 0.0, "successes": 0}
+        self._stats_backlog_bytes = os.path.getsize(log_path)
         
         # Load cache from disk
         self._load_cache()
+        
+        # Persist healings and log lines still pending when the test run ends
+        # (close() does it earlier and drops this hook)
+        atexit.register(self.flush)
 
     # ------------------------------------------------------------
     # CACHE MANAGEMENT
@@ -100,24 +225,69 @@ class AIHealer:
         """Load healing cache from disk."""
         if os.path.exists(self.cache_path):
             try:
-                with open(self.cache_path, "r") as f:
-                    self.cache = json.load(f)
+                data = _json_loads(Path(self.cache_path).read_bytes())
+                if isinstance(data, dict):
+                    # Older caches map "framework:locator:hint" strings to locators
+                    self.cache = {_legacy_cache_key(k): v for k, v in data.items()}
+                else:
+                    self.cache = {_intern_key(*record["k"]): record["v"] for record in data}
             except Exception as e:
-                print(f"[AI-Healer] Cache load failed: {e}. Starting with empty cache.")
+                logger.warning("[AI-Healer] Cache load failed: %s. Starting with empty cache.", e)
                 self.cache = {}
         else:
             # Initialize empty cache file
             self._save_cache()
     
     def _save_cache(self) -> None:
-        """Save healing cache to disk."""
+        """Save healing cache to disk as [{"k": [framework, locator, hint], "v": locator}, ...]."""
+        self._cache_dirty = False
+        self._last_cache_flush = time.monotonic()
         try:
-            with open(self.cache_path, "w") as f:
-                json.dump(self.cache, f, indent=2)
+            records = [{"k": key, "v": value} for key, value in self.cache.items()]
+            # Written to a private temp file and renamed over the cache, so
+            # readers (and other xdist workers) never see a half-written file
+            path = Path(self.cache_path)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_json_dumps(records))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except Exception as e:
-            print(f"[AI-Healer] Cache save failed: {e}")
+            logger.warning("[AI-Healer] Cache save failed: %s", e)
     
-    def _get_cache_key(self, framework: str, failed_locator: str, context_hint: str) -> str:
+    def _mark_cache_dirty(self) -> None:
+        """Note an unsaved cache change; write it out if the last flush is old enough."""
+        self._cache_dirty = True
+        if time.monotonic() - self._last_cache_flush >= CACHE_FLUSH_INTERVAL_S:
+            self._save_cache()
+    
+    def flush(self) -> None:
+        """Write pending cache changes and log lines to disk (call before reading either file)."""
+        if self._cache_dirty:
+            self._save_cache()
+        self._flush_log()
+    
+    def close(self) -> None:
+        """Flush pending changes, close the log file and drop the exit hook."""
+        self.flush()
+        if self._log_file is not None:
+            try:
+                self._log_file.close()
+            except Exception as e:
+                logger.warning("[AI-Healer] Log close failed: %s", e)
+            self._log_file = None
+        atexit.unregister(self.flush)
+    
+    def __enter__(self) -> "AIHealer":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _get_cache_key(self, framework: str, failed_locator: str, context_hint: str) -> CacheKey:
         """
         Generate cache key from framework, locator, and context.
         
@@ -127,15 +297,29 @@ class AIHealer:
             context_hint: Context hint for healing
             
         Returns:
-            Cache key string
+            Cache key tuple (hashed natively, no string formatting per lookup)
         """
-        return f"{framework}:{failed_locator}:{context_hint}"
+        return (framework, failed_locator, context_hint)
+    
+    def _html_digest(self, html_content: str) -> str:
+        """Digest of the HTML the healing prompt actually includes."""
+        data = html_content[:PROMPT_HTML_CHARS].encode("utf-8")
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(data)
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+    
+    def _remember_page_answer(self, page_key: Tuple[str, str, str], locator: str) -> None:
+        """Store an AI answer for the page, dropping the oldest past the cap."""
+        self._page_answers[page_key] = locator
+        if len(self._page_answers) > PAGE_ANSWER_CACHE_MAX_ITEMS:
+            del self._page_answers[next(iter(self._page_answers))]
     
     def clear_cache(self) -> None:
         """Clear all cached healing results."""
         self.cache = {}
+        self._page_answers = {}
         self._save_cache()
-        print("[AI-Healer] Cache cleared.")
+        logger.info("[AI-Healer] Cache cleared.")
 
     # ------------------------------------------------------------
     # PUBLIC API
@@ -173,10 +357,10 @@ class AIHealer:
         """
         start_time = time.perf_counter()
         
-        # 1. Check cache first
+        # 1. Check cache first (in-memory only: a hit never touches the cache file)
         cache_key = self._get_cache_key(engine, failed_locator, context_hint)
-        if cache_key in self.cache:
-            cached_locator = self.cache[cache_key]
+        cached_locator = self.cache.get(cache_key)
+        if cached_locator is not None:
             latency_ms = (time.perf_counter() - start_time) * 1000
             
             self._log_healing(
@@ -188,19 +372,27 @@ class AIHealer:
                 context_hint=context_hint
             )
             
-            print(f"[AI-Healer] ✅ Cache hit! Returning: {cached_locator}")
+            logger.info("[AI-Healer] ✅ Cache hit! Returning: %s", cached_locator)
             return cached_locator
         
-        # 2. Try AI healing with retry logic
+        # 2. Try AI healing with retry logic - unless the same page was already
+        #    healed for another framework (e.g. Playwright, then Selenium)
         html_content = page.content()
-        new_locator = self._call_ai_with_retry(
-            html_content=html_content,
-            failed_locator=failed_locator,
-            context_hint=context_hint,
-            engine=engine
-        )
-        
-        healing_source = "ai"
+        page_key = (self._html_digest(html_content), failed_locator, context_hint)
+        new_locator = self._page_answers.get(page_key)
+        if new_locator is not None:
+            healing_source = "cache"
+            logger.info("[AI-Healer] ✅ Same page healed before, reusing: %s", new_locator)
+        else:
+            new_locator = self._call_ai_with_retry(
+                html_content=html_content,
+                failed_locator=failed_locator,
+                context_hint=context_hint,
+                engine=engine
+            )
+            healing_source = "ai"
+            if new_locator != failed_locator:
+                self._remember_page_answer(page_key, new_locator)
         
         # 3. If AI failed, try heuristic fallback
         if new_locator == failed_locator:
@@ -208,13 +400,13 @@ class AIHealer:
             if fallback_locator:
                 new_locator = fallback_locator
                 healing_source = "fallback"
-                print(f"[AI-Healer] 🔄 Using fallback locator: {new_locator}")
+                logger.info("[AI-Healer] 🔄 Using fallback locator: %s", new_locator)
         
         # 4. If heuristic failed, try visual fallback (if enabled)
         if new_locator == failed_locator and self.vision_analyzer:
             if self.baseline_screenshot and self.current_screenshot:
                 try:
-                    print(f"[AI-Healer] 👁️ Attempting visual fallback...")
+                    logger.info("[AI-Healer] 👁️ Attempting visual fallback...")
                     visual_diffs = self.vision_analyzer.detect_visual_anomalies(
                         self.baseline_screenshot,
                         self.current_screenshot,
@@ -229,14 +421,14 @@ class AIHealer:
                         if visual_locator:
                             new_locator = visual_locator
                             healing_source = "vision"
-                            print(f"[AI-Healer] 👁️ Using vision-based locator: {new_locator}")
+                            logger.info("[AI-Healer] 👁️ Using vision-based locator: %s", new_locator)
                 except Exception as e:
-                    print(f"[AI-Healer] ⚠️ Visual fallback failed: {e}")
+                    logger.warning("[AI-Healer] ⚠️ Visual fallback failed: %s", e)
         
-        # 5. Cache successful healing
+        # 5. Cache successful healing (written to disk in batches)
         if new_locator != failed_locator:
             self.cache[cache_key] = new_locator
-            self._save_cache()
+            self._mark_cache_dirty()
         
         # 6. Log healing event
         latency_ms = (time.perf_counter() - start_time) * 1000
@@ -292,19 +484,19 @@ class AIHealer:
                 # Sanitize response
                 clean_locator = self._clean_ai_response(raw_response)
                 
-                print(f"[AI-Healer] ✅ AI healing successful on attempt {attempt + 1}")
+                logger.info("[AI-Healer] ✅ AI healing successful on attempt %s", attempt + 1)
                 return clean_locator
                 
             except Exception as e:
                 wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                 
-                print(f"[AI-Healer] ⚠️ Attempt {attempt + 1}/{max_attempts} failed: {e}")
+                logger.warning("[AI-Healer] ⚠️ Attempt %s/%s failed: %s", attempt + 1, max_attempts, e)
                 
                 if attempt < max_attempts - 1:
-                    print(f"[AI-Healer] 🔄 Retrying in {wait_time}s...")
+                    logger.info("[AI-Healer] 🔄 Retrying in %ss...", wait_time)
                     time.sleep(wait_time)
                 else:
-                    print(f"[AI-Healer] ❌ AI healing failed after {max_attempts} attempts")
+                    logger.warning("[AI-Healer] ❌ AI healing failed after %s attempts", max_attempts)
                     return failed_locator  # Return original on complete failure
         
         return failed_locator
@@ -336,7 +528,7 @@ The page HTML is below.
 {context_hint}
 
 HTML START:
-{html_content[:4000]}
+{html_content[:PROMPT_HTML_CHARS]}
 HTML END
 
 Suggest ONE working alternative locator (CSS or XPath) that likely matches
@@ -548,7 +740,7 @@ formatting, backticks, quotes, or explanations.
         confidence: Optional[float] = None
     ) -> None:
         """
-        Append healing record to JSON log with enhanced metadata.
+        Append healing record to the JSON Lines log with enhanced metadata.
         
         Args:
             old_locator: Original failed locator
@@ -575,14 +767,81 @@ formatting, backticks, quotes, or explanations.
             entry["confidence"] = confidence
         
         try:
-            with open(self.log_path, "r+") as f:
-                data = json.load(f)
-                data.append(entry)
-                f.seek(0)
-                f.truncate()
-                json.dump(data, f, indent=2)
+            # One appended line per event - the log is never rewritten, and
+            # lines reach the file in buffered batches
+            if self._log_file is None:
+                self._log_file = open(self.log_path, "ab", buffering=LOG_BUFFER_BYTES)
+            self._log_file.write(_json_dumps(entry) + b"\n")
+            self._count_healing(entry)
+            if time.monotonic() - self._last_log_flush >= LOG_FLUSH_INTERVAL_S:
+                self._flush_log()
+        except Exception as e:
+            logger.warning("[AI-Healer] Log write failed: %s", e)
+    
+    def _count_healing(self, entry: Dict[str, Any]) -> None:
+        """Add one healing record to the running stats."""
+        stats = self._stats
+        stats["total"] += 1
+        stats["by_source"][entry.get("healing_source", "unknown")] += 1
+        stats["latency_sum_ms"] += entry.get("latency_ms", 0.0)
+        if entry.get("success", False):
+            stats["successes"] += 1
+    
+    def _flush_log(self) -> None:
+        """Write buffered log lines to the log file."""
+        self._last_log_flush = time.monotonic()
+        if self._log_file is not None:
+            try:
+                self._log_file.flush()
+            except Exception as e:
+                logger.warning("[AI-Healer] Log flush failed: %s", e)
+    
+    def _init_log(self) -> None:
+        """Create the JSON Lines log, converting a legacy JSON-array log in place."""
+        path = Path(self.log_path)
+        if not path.exists():
+            path.touch()
+            return
+        
+        content = path.read_bytes()
+        if not content.lstrip().startswith(b"["):
+            return
+        try:
+            entries = _parse_log(content)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(b"".join(_json_dumps(entry) + b"\n" for entry in entries))
+            os.replace(tmp_path, path)
         except Exception as e:
-            print(f"[AI-Healer] Log write failed: {e}")
+            logger.warning("[AI-Healer] Log conversion to JSON Lines failed: %s", e)
+    
+    def _tail_log(self, limit: int) -> list:
+        """
+        Last `limit` healing records, read backwards from the end of the log.
+        
+        Reads a LOG_TAIL_BLOCK_BYTES block from the end (doubling it while it
+        holds too few records), so the cost tracks `limit`, not the log size.
+        """
+        self._flush_log()
+        with open(self.log_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            block = LOG_TAIL_BLOCK_BYTES
+            while True:
+                start = max(0, size - block)
+                f.seek(start)
+                content = f.read(size - start)
+                if start == 0:
+                    return _parse_log(content)[-limit:] if limit > 0 else []
+                
+                # Drop the line cut by the block boundary
+                entries = _parse_log(content.split(b"\n", 1)[1] if b"\n" in content else b"")
+                if len(entries) >= limit:
+                    return entries[-limit:] if limit > 0 else []
+                block *= 2
+    
+    def _read_log(self) -> list:
+        """All healing records from the log (including buffered ones)."""
+        self._flush_log()
+        return _parse_log(Path(self.log_path).read_bytes())
 
     # ------------------------------------------------------------
     # DIAGNOSTIC & UTILITY METHODS
@@ -596,14 +855,11 @@ formatting, backticks, quotes, or explanations.
             limit: Number of recent records to display
         """
         try:
-            with open(self.log_path, "r") as f:
-                data = json.load(f)
-            
             print("\n--- Recent Healing Events ---")
-            for entry in data[-limit:]:
+            for entry in self._tail_log(limit):
                 print(json.dumps(entry, indent=2))
         except Exception as e:
-            print(f"[AI-Healer] Could not read log: {e}")
+            logger.warning("[AI-Healer] Could not read log: %s", e)
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """
@@ -614,48 +870,42 @@ formatting, backticks, quotes, or explanations.
         """
         return {
             "cache_size": len(self.cache),
-            "cache_keys": list(self.cache.keys())[:10]  # Show first 10 keys
+            "cache_keys": [":".join(key) for key in list(self.cache)[:10]]  # Show first 10 keys
         }
     
     def get_healing_stats(self) -> Dict[str, Any]:
         """
-        Get healing statistics from log file.
+        Get healing statistics from running counters.
+        
+        The log is read once, on the first call, for records written before
+        this healer was created; after that every call is O(1).
         
         Returns:
             Dict with healing counts by source, success rate, avg latency
         """
         try:
-            with open(self.log_path, "r") as f:
-                data = json.load(f)
+            if self._stats_backlog_bytes:
+                with open(self.log_path, "rb") as f:
+                    backlog = f.read(self._stats_backlog_bytes)
+                for entry in _parse_log(backlog):
+                    self._count_healing(entry)
+                self._stats_backlog_bytes = 0
             
-            if not data:
+            stats = self._stats
+            total = stats["total"]
+            if not total:
                 return {"total": 0}
             
-            # Count by source
-            sources = {"cache": 0, "ai": 0, "fallback": 0}
-            successes = 0
-            total_latency = 0.0
-            
-            for entry in data:
-                source = entry.get("healing_source", "unknown")
-                if source in sources:
-                    sources[source] += 1
-                
-                if entry.get("success", False):
-                    successes += 1
-                
-                total_latency += entry.get("latency_ms", 0.0)
-            
-            total = len(data)
+            by_source = stats["by_source"]
+            sources = {"cache": by_source["cache"], "ai": by_source["ai"], "fallback": by_source["fallback"]}
             
             return {
                 "total_healings": total,
                 "by_source": sources,
-                "success_rate": round(successes / total * 100, 2) if total > 0 else 0,
-                "avg_latency_ms": round(total_latency / total, 2) if total > 0 else 0,
-                "cache_hit_rate": round(sources["cache"] / total * 100, 2) if total > 0 else 0
+                "success_rate": round(stats["successes"] / total * 100, 2),
+                "avg_latency_ms": round(stats["latency_sum_ms"] / total, 2),
+                "cache_hit_rate": round(sources["cache"] / total * 100, 2)
             }
         except Exception as e:
-            print(f"[AI-Healer] Could not calculate stats: {e}")
+            logger.warning("[AI-Healer] Could not calculate stats: %s", e)
             return {"error": str(e)}
-
@@ -208,6 +208,17 @@ class FrameworkAdapter(ABC):
         """Return framework name (playwright, selenium, etc.)."""
         pass
 
+    @property
+    def supports_concurrent_calls(self) -> bool:
+        """
+        Whether the adapter can be driven from several threads at once.
+
+        Selenium WebDriver and the Playwright sync API are NOT thread-safe,
+        so the built-in adapters return False. Thread-safe adapters can
+        override this to let SmartLocator overlap retries with AI healing.
+        """
+        return False
+
 
 class PlaywrightAdapter(FrameworkAdapter):
     """
@@ -43,29 +43,79 @@ Example:
     locator.click()  # Same API, different framework!
 """
 
-from typing import Optional
-import sys
-from pathlib import Path
-
-# Import locator repair service
-from services.locator_repair import LocatorRepairService
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional
+import threading
+import time
 
 from .framework_adapter import FrameworkAdapter
 
 
+# Delay before the speculative bare re-try (lets a transient DOM race settle)
+SPECULATIVE_RETRY_DELAY = 0.1
+
+# Frameworks understood by the repair service
+SUPPORTED_FRAMEWORKS = frozenset({"playwright", "selenium"})
+
+# Shared pool for background repairs during speculative recovery (created on first use)
+_repair_pool: Optional[ThreadPoolExecutor] = None
+
+
+# Shared repair service (created on first heal)
+_repair_service = None
+_repair_service_lock = threading.Lock()
+
+
+def _get_repair_service():
+    """
+    Get the shared LocatorRepairService, importing it on first use.
+    
+    The repair service pulls in the AI gateway and its provider SDKs,
+    so runs where no locator ever breaks never pay that import cost.
+    """
+    global _repair_service
+    if _repair_service is None:
+        with _repair_service_lock:
+            if _repair_service is None:
+                from services.locator_repair import LocatorRepairService
+                _repair_service = LocatorRepairService()
+    return _repair_service
+
+
+def _get_repair_pool() -> ThreadPoolExecutor:
+    """Get the shared background repair pool."""
+    global _repair_pool
+    if _repair_pool is None:
+        _repair_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="locator-repair")
+    return _repair_pool
+
+
 class SmartLocator:
     """
     Self-healing locator that automatically repairs broken selectors.
     
     Works with any framework through adapters.
     """
+
+    # Created once per selector per page - keep instances small
+    __slots__ = (
+        "original_locator",
+        "current_locator",
+        "adapter",
+        "context_hint",
+        "max_retries",
+        "repair_service",
+        "healed",
+        "_framework_name",
+    )
     
     def __init__(
         self,
         locator: str,
         adapter: FrameworkAdapter,
         context_hint: str = "",
-        max_retries: int = 1
+        max_retries: int = 1,
+        repair_service=None
     ):
         """
         Initialize SmartLocator.
@@ -75,92 +125,148 @@ class SmartLocator:
             adapter: Framework adapter (PlaywrightAdapter, SeleniumAdapter)
             context_hint: Human-readable description (e.g., "Submit button")
             max_retries: How many times to attempt healing (default: 1)
+            repair_service: Repair service to use (default: shared local
+                LocatorRepairService, created on first heal)
         """
         self.original_locator = locator
         self.current_locator = locator
         self.adapter = adapter
         self.context_hint = context_hint
         self.max_retries = max_retries
-        self.repair_service = LocatorRepairService()
+        self.repair_service = repair_service
         self.healed = False
+
+        # Resolve once - unknown frameworks fall back to Playwright syntax
+        framework_name = adapter.framework_name
+        self._framework_name: Literal["playwright", "selenium"] = (
+            framework_name if framework_name in SUPPORTED_FRAMEWORKS else "playwright"
+        )
     
     def click(self):
         """Click the element (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.click(loc)
-        )
+        return self._execute_with_healing("click")
     
     def fill(self, text: str):
         """Fill text into element (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.fill(loc, text)
-        )
+        return self._execute_with_healing("fill", text)
     
     def text(self) -> str:
         """Get element text (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.get_text(loc)
-        )
+        return self._execute_with_healing("get_text")
     
     def is_visible(self) -> bool:
         """Check if element is visible (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.is_visible(loc)
-        )
+        return self._execute_with_healing("is_visible")
     
     def element(self):
         """Get the underlying framework element."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.find_element(loc)
-        )
+        return self._execute_with_healing("find_element")
     
-    def _execute_with_healing(self, action):
+    def _execute_with_healing(self, adapter_method: str, *args):
         """
-        Execute action with automatic healing on failure.
+        Execute adapter action with automatic healing on failure.
         
         Args:
-            action: Lambda that takes locator and performs action
+            adapter_method: Name of the FrameworkAdapter method to call
+            *args: Extra arguments passed after the locator
             
         Returns:
             Result of action
         """
-        retries = 0
-        last_error = None
+        # Hot path - keep lookups in locals
+        adapter = self.adapter
+        action = getattr(adapter, adapter_method)
+        max_retries = self.max_retries
         
-        while retries <= self.max_retries:
+        for attempt in range(max_retries + 1):
+            current_locator = self.current_locator
             try:
                 # Try with current locator
-                result = action(self.current_locator)
-                
-                # Log if we successfully healed
-                if self.healed:
-                    print(f"✅ Healed locator working: {self.current_locator}")
-                
-                return result
+                result = action(current_locator, *args)
                 
             except Exception as e:
-                last_error = e
-                
-                if retries >= self.max_retries:
+                if attempt == max_retries:
                     print(f"❌ Max retries reached. Last error: {e}")
                     raise
                 
                 # Attempt healing
-                print(f"⚠️  Locator failed: {self.current_locator}")
-                print(f"🔧 Attempting AI-powered repair... (attempt {retries + 1}/{self.max_retries + 1})")
-                
+                print(f"⚠️  Locator failed: {current_locator}")
+                print(f"🔧 Attempting AI-powered repair... (attempt {attempt + 1}/{max_retries + 1})")
+
+                # Thread-safe adapters overlap a bare re-try with the AI repair
+                # (the page source is only fetched once something has failed)
+                if attempt == 0 and adapter.supports_concurrent_calls:
+                    recovered, result = self._speculative_recover(action, args)
+                    if recovered:
+                        return result
+                    if attempt + 1 >= max_retries:
+                        print(f"❌ Speculative recovery failed. Original error: {e}")
+                        raise
+                    continue
+
                 repaired = self._heal_locator()
-                
-                if repaired:
-                    self.current_locator = repaired
-                    self.healed = True
-                    retries += 1
-                else:
+                if not repaired:
                     print(f"❌ Healing failed. Original error: {e}")
                     raise
+
+                self.current_locator = repaired
+                self.healed = True
+                continue
+
+            # Log if we successfully healed
+            if self.healed:
+                print(f"✅ Healed locator working: {current_locator}")
+            
+            return result
         
-        raise last_error or Exception("Unknown error in healing process")
-    
+        raise Exception("Unknown error in healing process")
+
+    def _speculative_recover(self, action, args=()):
+        """
+        Overlap a bare re-try of the current locator with an AI repair.
+
+        Many failures are transient DOM races that succeed on a plain
+        re-try long before an LLM round-trip completes. The repair is
+        computed in the background while the caller thread re-tries; only
+        the caller thread ever runs the action, so a click/fill/drag is
+        never performed by both paths.
+
+        Args:
+            action: Bound adapter method taking the locator first
+            args: Extra arguments passed after the locator
+
+        Returns:
+            Tuple of (recovered, result of action)
+        """
+        failed_locator = self.current_locator
+
+        # The background task fetches the page and computes the repaired
+        # locator only - it never acts on the element
+        repair = _get_repair_pool().submit(self._heal_locator)
+
+        time.sleep(SPECULATIVE_RETRY_DELAY)
+        try:
+            result = action(failed_locator, *args)
+        except Exception:
+            pass
+        else:
+            # The repair result (if any) is simply discarded
+            print(f"✅ Re-try succeeded without healing: {failed_locator}")
+            return True, result
+
+        repaired = repair.result()
+        if not repaired:
+            return False, None
+        try:
+            result = action(repaired, *args)
+        except Exception:
+            return False, None
+
+        self.current_locator = repaired
+        self.healed = True
+        print(f"✅ Healed locator working: {repaired}")
+        return True, result
+
     def _heal_locator(self) -> Optional[str]:
         """
         Attempt to heal the broken locator using AI service.
@@ -172,13 +278,12 @@ class SmartLocator:
             # Get current page HTML
             page_source = self.adapter.get_page_source()
             
+            if self.repair_service is None:
+                self.repair_service = _get_repair_service()
+
             # Call universal repair service
-            framework_name = self.adapter.framework_name
-            if framework_name not in ("playwright", "selenium"):
-                framework_name = "playwright"  # Default fallback
-                
             response = self.repair_service.repair_locator(
-                framework=framework_name,  # type: ignore
+                framework=self._framework_name,
                 page_source=page_source,
                 failed_locator=self.current_locator,
                 context_hint=self.context_hint
@@ -212,21 +317,15 @@ class SmartLocator:
     
     def check(self):
         """Check checkbox (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.check_checkbox(loc)
-        )
+        return self._execute_with_healing("check_checkbox")
     
     def uncheck(self):
         """Uncheck checkbox (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.uncheck_checkbox(loc)
-        )
+        return self._execute_with_healing("uncheck_checkbox")
     
     def is_checked(self) -> bool:
         """Check if checkbox/radio is checked (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.is_checked(loc)
-        )
+        return self._execute_with_healing("is_checked")
     
     def select_option(self, value: str, by: str = "value"):
         """
@@ -236,104 +335,72 @@ class SmartLocator:
             value: Value to select
             by: Selection method - "value", "label"/"text", or "index"
         """
-        return self._execute_with_healing(
-            lambda loc: self.adapter.select_dropdown(loc, value, by)
-        )
+        return self._execute_with_healing("select_dropdown", value, by)
     
     def get_selected_option(self) -> str:
         """Get selected dropdown option (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.get_selected_option(loc)
-        )
+        return self._execute_with_healing("get_selected_option")
     
     def upload_file(self, file_path: str):
         """Upload file (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.upload_file(loc, file_path)
-        )
+        return self._execute_with_healing("upload_file", file_path)
     
     # ==================== HOVER & VISIBILITY (with auto-healing) ====================
     
     def hover(self):
         """Hover over element for tooltips/dropdowns (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.hover(loc)
-        )
+        return self._execute_with_healing("hover")
     
     def wait_visible(self, timeout: int = 10) -> bool:
         """Wait for element to be visible (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.wait_for_visible(loc, timeout)
-        )
+        return self._execute_with_healing("wait_for_visible", timeout)
     
     def wait_hidden(self, timeout: int = 10) -> bool:
         """Wait for element to be hidden (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.wait_for_hidden(loc, timeout)
-        )
+        return self._execute_with_healing("wait_for_hidden", timeout)
     
     def is_enabled(self) -> bool:
         """Check if element is enabled (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.is_enabled(loc)
-        )
+        return self._execute_with_healing("is_enabled")
     
     # ==================== ATTRIBUTES & PROPERTIES (with auto-healing) ====================
     
     def get_attribute(self, attribute: str) -> Optional[str]:
         """Get element attribute (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.get_attribute(loc, attribute)
-        )
+        return self._execute_with_healing("get_attribute", attribute)
     
     def get_property(self, property_name: str):
         """Get element property (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.get_property(loc, property_name)
-        )
+        return self._execute_with_healing("get_property", property_name)
     
     def get_value(self) -> str:
         """Get input/textarea value (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.get_value(loc)
-        )
+        return self._execute_with_healing("get_value")
     
     # ==================== ACTIONS (with auto-healing) ====================
     
     def double_click(self):
         """Double-click element (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.double_click(loc)
-        )
+        return self._execute_with_healing("double_click")
     
     def right_click(self):
         """Right-click element for context menu (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.right_click(loc)
-        )
+        return self._execute_with_healing("right_click")
     
     def drag_to(self, target_locator: str):
         """Drag this element to target (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.drag_and_drop(loc, target_locator)
-        )
+        return self._execute_with_healing("drag_and_drop", target_locator)
     
     def scroll_into_view(self):
         """Scroll element into view (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.scroll_into_view(loc)
-        )
+        return self._execute_with_healing("scroll_into_view")
     
     def press_key(self, key: str):
         """Press keyboard key on element (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.press_key(loc, key)
-        )
+        return self._execute_with_healing("press_key", key)
     
     # ==================== MULTI-ELEMENT (with auto-healing) ====================
     
     def count(self) -> int:
         """Get count of matching elements (with auto-healing)."""
-        return self._execute_with_healing(
-            lambda loc: self.adapter.get_element_count(loc)
-        )
+        return self._execute_with_healing("get_element_count")
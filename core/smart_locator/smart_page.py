@@ -38,7 +38,12 @@ class SmartPage:
     - Works with Playwright, Selenium, or any framework
     - Auto-healing locators
     - Clean, framework-agnostic API
+    
+    Subclasses that do not declare __slots__ keep a regular __dict__,
+    so page objects can still add locator attributes freely.
     """
+
+    __slots__ = ("adapter", "_locators")
     
     def __init__(self, adapter: FrameworkAdapter):
         """
@@ -10,18 +10,389 @@ Features:
   ✅ Visual diff detection and analysis
   ✅ Cache visual analysis results
   ✅ Suggest locators from visual differences
+
+Performance:
+  - Optional OpenCV backend (image_backend="cv2") for SIMD decode,
+    resize and absdiff on large screenshots
+  - Optional Numba kernel fusing diff, pixel count and bounding box
+    into a single parallel pass (NumPy fallback when not installed)
+  - On the default Pillow backend, installing `pillow-simd` as a
+    drop-in replacement for Pillow speeds up resize/difference
 -------------------------------------------------
 """
 
+from __future__ import annotations
+
 import os
+import re
+import copy
 import json
 import base64
 import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 from datetime import datetime
-from PIL import Image, ImageChops, ImageDraw, ImageFont
-import numpy as np
+
+# Imaging libraries (NumPy, Pillow, optional OpenCV/Numba) are imported on
+# first pixel work by _load_image_libs() - importing this module, building
+# an analyzer or running LLM-only analysis does not pay for them
+np = None
+Image = None
+cv2 = None
+numba = None
+_image_libs_loaded = False
+
+# Fast JSON for the cache log (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Image content digests: XXH3 if installed (non-cryptographic, SIMD), SHA-256 otherwise
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Mean per-channel difference above which a pixel counts as "changed"
+REGION_THRESHOLD = 30
+
+# Connected-component regions (OpenCV): ignore specks, keep the largest N
+MIN_REGION_AREA = 4
+MAX_REGIONS = 50
+
+# Element keywords in LLM responses. Word start only, so "buttons" and
+# "navigation" still match but "context" no longer counts as "text"
+_ELEMENT_RE = re.compile(r'\b(button|input|link|text|image|form|menu|nav)', re.IGNORECASE)
+
+# Read size when base64-encoding images (must be a multiple of 3)
+BASE64_CHUNK_SIZE = 48 * 1024
+
+# Decoded-image LRU (shared across analyzers) - screenshots are 5-20MB each
+DECODED_CACHE_MAX_ITEMS = 8
+DECODED_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# compare_images result LRU (per analyzer)
+COMPARE_CACHE_MAX_ITEMS = 256
+
+_decoded_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_decoded_cache_bytes = 0
+_decoded_cache_lock = threading.Lock()
+
+
+# Background diff-map encoding: path -> Future of the in-flight write
+_io_pool: Optional[ThreadPoolExecutor] = None
+_pending_writes: Dict[str, Future] = {}
+_pending_writes_lock = threading.Lock()
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    """Get the shared diff-map writer pool (created on first use)."""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vision-io")
+    return _io_pool
+
+
+def _write_in_background(path: str, write, *args, **kwargs) -> None:
+    """
+    Run write(*args, **kwargs) on the I/O pool and track it by path.
+    
+    PNG encoders release the GIL, so encoding overlaps with the caller.
+    """
+    with _pending_writes_lock:
+        future = _get_io_pool().submit(write, *args, **kwargs)
+        _pending_writes[path] = future
+    future.add_done_callback(lambda done, path=path: _forget_write(path, done))
+
+
+def _forget_write(path: str, future: Future) -> None:
+    """Drop a finished write from the registry (unless superseded)."""
+    with _pending_writes_lock:
+        if _pending_writes.get(path) is future:
+            del _pending_writes[path]
+
+
+def _wait_for_pending_write(path: str, timeout: Optional[float] = None) -> bool:
+    """
+    Block until a background write to path (if any) has finished.
+    
+    Returns:
+        bool: False if the write failed or timed out
+    """
+    with _pending_writes_lock:
+        future = _pending_writes.get(os.fspath(path))
+    if future is None:
+        return True
+    try:
+        future.result(timeout)
+        return True
+    except Exception as e:
+        print(f"[Vision] ⚠️ Diff map write failed: {e}")
+        return False
+
+
+def _load_image_libs() -> None:
+    """Import NumPy and Pillow, plus OpenCV/Numba when installed (once)."""
+    global np, Image, cv2, numba, _image_libs_loaded
+    if _image_libs_loaded:
+        return
+    
+    import numpy as np
+    from PIL import Image
+    
+    # Optional OpenCV backend for image decode/resize/diff
+    try:
+        import cv2
+    except ImportError:
+        cv2 = None
+    
+    # Optional Numba JIT for the fused diff kernel
+    try:
+        import numba
+    except ImportError:
+        numba = None
+    
+    _image_libs_loaded = True
+
+
+def _file_key(path: str) -> tuple:
+    """Identity of an image file on disk: (path, mtime_ns, size)."""
+    stat = os.stat(path)
+    return (os.fspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=COMPARE_CACHE_MAX_ITEMS)
+def _file_digest(file_key: tuple) -> bytes:
+    """Digest of an image file's content, hashed once per _file_key identity."""
+    with open(file_key[0], 'rb') as f:
+        return hashlib.file_digest(f, xxhash.xxh3_128 if xxhash is not None else 'sha256').digest()
+
+
+def _decode_image(path: str, backend: str) -> np.ndarray:
+    """Decode an image to a uint8 H x W x 3 array (RGB, or BGR for cv2)."""
+    if backend == "cv2":
+        array = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if array is None:
+            raise ValueError(f"Failed to read image {path}")
+        return array
+    with Image.open(path) as img:
+        # Browser screenshots are usually RGB already - skip the extra copy
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        return np.asarray(img)
+
+
+def _load_image_array(path: str, file_key: tuple, backend: str) -> np.ndarray:
+    """
+    Decode an image through the shared LRU so repeated baselines decode once.
+    
+    Args:
+        path (str): Image path
+        file_key (tuple): _file_key(path) - a rewritten file misses the cache
+        backend (str): 'pillow' or 'cv2'
+        
+    Returns:
+        np.ndarray: Read-only uint8 array (shared - never modify in place)
+    """
+    global _decoded_cache_bytes
+    key = (file_key, backend)
+    with _decoded_cache_lock:
+        array = _decoded_cache.get(key)
+        if array is not None:
+            _decoded_cache.move_to_end(key)
+            return array
+    
+    array = _decode_image(path, backend)
+    array.setflags(write=False)
+    if array.nbytes > DECODED_CACHE_MAX_BYTES:
+        return array
+    
+    with _decoded_cache_lock:
+        if key not in _decoded_cache:
+            _decoded_cache[key] = array
+            _decoded_cache_bytes += array.nbytes
+        # Evict least recently used until under both count and size caps
+        while (len(_decoded_cache) > DECODED_CACHE_MAX_ITEMS
+               or _decoded_cache_bytes > DECODED_CACHE_MAX_BYTES):
+            _, evicted = _decoded_cache.popitem(last=False)
+            _decoded_cache_bytes -= evicted.nbytes
+    return array
+
+
+def _resize_image_array(array: np.ndarray, shape: tuple, backend: str) -> np.ndarray:
+    """Lanczos-resize an image array to the (height, width) of shape."""
+    height, width = shape[0], shape[1]
+    if backend == "cv2":
+        return cv2.resize(array, (width, height), interpolation=cv2.INTER_LANCZOS4)
+    return np.asarray(Image.fromarray(array).resize((width, height), Image.Resampling.LANCZOS))
+
+
+def _diff_and_bbox_numpy(baseline: np.ndarray, current: np.ndarray, threshold: int):
+    """
+    Diff two equal-shape uint8 RGB arrays and locate the changed area.
+    
+    Args:
+        baseline (np.ndarray): H x W x 3 uint8 array
+        current (np.ndarray): H x W x 3 uint8 array
+        threshold (int): Mean channel difference for a changed pixel
+        
+    Returns:
+        tuple: (diff_pixels, changed_pixels, rmin, rmax, cmin, cmax) -
+               diff_pixels counts differing channel values, changed_pixels
+               the pixels above threshold; rmax/cmax are -1 if nothing changed
+    """
+    # uint8 absolute difference without widening the whole array
+    diff = np.maximum(baseline, current) - np.minimum(baseline, current)
+    diff_pixels = int(np.count_nonzero(diff))
+    
+    # Integer channel sum compares exactly to mean > threshold
+    changed_mask = diff.sum(axis=2, dtype=np.uint16) > threshold * diff.shape[2]
+    rows = np.flatnonzero(changed_mask.any(axis=1))
+    if rows.size == 0:
+        return diff_pixels, 0, 0, -1, 0, -1
+    cols = np.flatnonzero(changed_mask.any(axis=0))
+    changed_pixels = int(np.count_nonzero(changed_mask))
+    return diff_pixels, changed_pixels, int(rows[0]), int(rows[-1]), int(cols[0]), int(cols[-1])
+
+
+def _diff_and_bbox_kernel(baseline, current, threshold):
+    """Numba kernel with the same contract as _diff_and_bbox_numpy."""
+    rows, cols, channels = baseline.shape
+    limit = threshold * channels
+    
+    # Per-row partials keep the parallel loop free of shared writes
+    row_nonzero = np.zeros(rows, np.int64)
+    row_changed = np.zeros(rows, np.int64)
+    row_cmin = np.full(rows, cols, np.int64)
+    row_cmax = np.full(rows, -1, np.int64)
+    
+    for r in numba.prange(rows):
+        nonzero = 0
+        changed = 0
+        cmin = cols
+        cmax = -1
+        for c in range(cols):
+            total = 0
+            for ch in range(channels):
+                d = abs(np.int32(baseline[r, c, ch]) - np.int32(current[r, c, ch]))
+                if d:
+                    nonzero += 1
+                total += d
+            if total > limit:
+                changed += 1
+                if c < cmin:
+                    cmin = c
+                cmax = c
+        row_nonzero[r] = nonzero
+        row_changed[r] = changed
+        row_cmin[r] = cmin
+        row_cmax[r] = cmax
+    
+    # Serial reduction across rows
+    rmin, rmax, cmin, cmax = 0, -1, cols, -1
+    for r in range(rows):
+        if row_cmax[r] >= 0:
+            if rmax < 0:
+                rmin = r
+            rmax = r
+            cmin = min(cmin, row_cmin[r])
+            cmax = max(cmax, row_cmax[r])
+    if rmax < 0:
+        cmin = 0
+    return row_nonzero.sum(), row_changed.sum(), rmin, rmax, cmin, cmax
+
+
+_diff_kernel = None
+
+
+def _diff_and_bbox(baseline: np.ndarray, current: np.ndarray, threshold: int):
+    """
+    Fused diff/count/bbox pass - Numba kernel if installed, NumPy otherwise.
+    
+    See _diff_and_bbox_numpy for arguments and return value.
+    """
+    global _diff_kernel
+    if _diff_kernel is None:
+        _load_image_libs()
+        if numba is not None:
+            # JIT-compiled here, on first use; cache=True persists the machine code
+            _diff_kernel = numba.njit(parallel=True, fastmath=True, cache=True)(_diff_and_bbox_kernel)
+        else:
+            _diff_kernel = _diff_and_bbox_numpy
+    return _diff_kernel(baseline, current, threshold)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _content_key(result_key: tuple) -> tuple:
+    """compare_images cache key with the two file keys replaced by content digests."""
+    return (_file_digest(result_key[0]), _file_digest(result_key[1])) + result_key[2:]
+
+
+def _bbox_regions(rmin: int, rmax: int, cmin: int, cmax: int, area: int) -> List[Dict[str, Any]]:
+    """
+    Build the region list for a changed-area bounding box (empty if none).
+    
+    Same schema as _component_regions: inclusive width/height and "area"
+    as the number of changed pixels inside the box.
+    """
+    if rmax < 0 or cmax < 0:
+        return []
+    return [{
+        "x": int(cmin),
+        "y": int(rmin),
+        "width": int(cmax - cmin + 1),
+        "height": int(rmax - rmin + 1),
+        "area": int(area)
+    }]
+
+
+def _component_regions(changed_mask: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Label 8-connected changed areas with OpenCV and return one box per area.
+    
+    Args:
+        changed_mask (np.ndarray): H x W boolean mask of changed pixels
+        
+    Returns:
+        list: Regions sorted largest first (x, y, width, height, area in px)
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(
+        changed_mask.astype(np.uint8), connectivity=8
+    )
+    regions = []
+    for label in range(1, count):  # Label 0 is the background
+        area = int(stats[label, cv2.CC_STAT_AREA])
+        if area < MIN_REGION_AREA:
+            continue
+        regions.append({
+            "x": int(stats[label, cv2.CC_STAT_LEFT]),
+            "y": int(stats[label, cv2.CC_STAT_TOP]),
+            "width": int(stats[label, cv2.CC_STAT_WIDTH]),
+            "height": int(stats[label, cv2.CC_STAT_HEIGHT]),
+            "area": area
+        })
+    regions.sort(key=lambda region: region["area"], reverse=True)
+    return regions[:MAX_REGIONS]
 
 
 class VisionAnalyzer:
@@ -45,11 +416,23 @@ class VisionAnalyzer:
         >>> anomalies = analyzer.detect_visual_anomalies("baseline.png", "current.png")
     """
     
+    __slots__ = (
+        "provider",
+        "cache_dir",
+        "cache_file",
+        "cache",
+        "_cache_lines",
+        "_compare_cache",
+        "image_backend",
+        "ai_gateway",
+    )
+    
     def __init__(
         self,
         provider: str = "gemini",
         cache_dir: str = "logs/vision_cache",
-        ai_gateway = None
+        ai_gateway = None,
+        image_backend: str = "pillow"
     ):
         """
         Initialize Vision Analyzer with provider and cache directory.
@@ -58,6 +441,8 @@ class VisionAnalyzer:
             provider (str): Vision LLM provider ('gemini' or 'openai')
             cache_dir (str): Directory for caching visual analysis results
             ai_gateway: Optional AIGateway instance for LLM communication
+            image_backend (str): Pixel backend for compare_images - 'pillow'
+                (default) or 'cv2' (falls back to Pillow if OpenCV is missing)
             
         Example:
             >>> analyzer = VisionAnalyzer(provider="gemini", cache_dir="logs/vision_cache")
@@ -66,8 +451,20 @@ class VisionAnalyzer:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        self.cache_file = self.cache_dir / "vision_cache.json"
+        # Append-only log: one {"k": key, "v": result} record per line
+        self.cache_file = self.cache_dir / "vision_cache.jsonl"
         self.cache: Dict[str, Any] = {}
+        self._cache_lines = 0
+        
+        # compare_images results keyed by both files' (path, mtime, size)
+        self._compare_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        
+        if image_backend == "cv2":
+            _load_image_libs()
+        if image_backend == "cv2" and cv2 is None:
+            print("[Vision] Warning: OpenCV not installed, using Pillow backend")
+            image_backend = "pillow"
+        self.image_backend = image_backend
         
         # Import AIGateway if not provided
         if ai_gateway is None:
@@ -85,30 +482,95 @@ class VisionAnalyzer:
     
     
     def _load_cache(self) -> None:
-        """Load visual analysis cache from disk."""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-                print(f"[Vision] 📦 Loaded {len(self.cache)} cached visual analyses")
-            except Exception as e:
-                print(f"[Vision] ⚠️ Cache load error: {e}")
-                self.cache = {}
+        """Load visual analysis cache from disk (last record per key wins)."""
+        legacy_file = self.cache_file.with_suffix(".json")
+        try:
+            if self.cache_file.exists():
+                torn = False
+                with open(self.cache_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = _json_loads(line)
+                        except ValueError:
+                            torn = True  # Interrupted append
+                            continue
+                        self.cache[record["k"]] = record["v"]
+                        self._cache_lines += 1
+                if torn:
+                    # Rewrite so the next append does not land on a partial line
+                    self.compact()
+            elif legacy_file.exists():
+                # One-time migration from the old pretty-printed JSON cache
+                with open(legacy_file, 'rb') as f:
+                    self.cache = _json_loads(f.read())
+                self._save_cache()
+            else:
+                return
+            print(f"[Vision] 📦 Loaded {len(self.cache)} cached visual analyses")
+        except Exception as e:
+            print(f"[Vision] ⚠️ Cache load error: {e}")
+            self.cache = {}
+            self._cache_lines = 0
+    
+    
+    def _append_cache_entry(self, key: str, value: Any) -> None:
+        """Append one cache record - O(1) per insert instead of a full rewrite."""
+        try:
+            with open(self.cache_file, 'ab') as f:
+                f.write(_json_dumps({"k": key, "v": value}) + b"\n")
+            self._cache_lines += 1
+        except Exception as e:
+            print(f"[Vision] ⚠️ Cache save error: {e}")
+            return
+        
+        # Superseded records pile up when keys are re-analyzed
+        if self._cache_lines > 2 * len(self.cache):
+            self.compact()
     
     
     def _save_cache(self) -> None:
-        """Persist visual analysis cache to disk."""
+        """
+        Persist visual analysis cache to disk (one line per live entry).
+        
+        Written to a temp file and swapped in with os.replace, so a crash
+        mid-write leaves the previous cache intact instead of truncated.
+        """
+        tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2)
+            with open(tmp_file, 'wb') as f:
+                f.write(b"".join(
+                    _json_dumps({"k": key, "v": value}) + b"\n"
+                    for key, value in self.cache.items()
+                ))
+            os.replace(tmp_file, self.cache_file)
+            self._cache_lines = len(self.cache)
         except Exception as e:
             print(f"[Vision] ⚠️ Cache save error: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    
+    
+    def compact(self) -> None:
+        """Rewrite the cache log without superseded records."""
+        self._save_cache()
     
     
     def _get_cache_key(self, *args) -> str:
-        """Generate cache key from arguments."""
-        key_str = "|".join(str(arg) for arg in args)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        """
+        Generate cache key from arguments (hashed incrementally, no joined string).
+        
+        Always stdlib BLAKE2b: keys are persisted in vision_cache.jsonl, so
+        the hash must not depend on which optional packages are installed.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for arg in args:
+            h.update(str(arg).encode('utf-8'))
+            h.update(b'|')
+        return h.hexdigest()
     
     
     def _encode_image_base64(self, image_path: str) -> str:
@@ -122,8 +584,13 @@ class VisionAnalyzer:
             str: Base64-encoded image string
         """
         try:
-            with open(image_path, 'rb') as f:
-                return base64.b64encode(f.read()).decode('utf-8')
+            # Encode in 48KB chunks (multiple of 3, so no padding mid-stream)
+            # instead of holding the raw file and its encoding at once
+            encoded = bytearray()
+            with open(image_path, 'rb', buffering=0) as f:
+                while chunk := f.read(BASE64_CHUNK_SIZE):
+                    encoded += base64.b64encode(chunk)
+            return encoded.decode('ascii')
         except Exception as e:
             raise ValueError(f"Failed to encode image {image_path}: {e}")
     
@@ -160,66 +627,222 @@ class VisionAnalyzer:
             >>> if diff["similarity"] < 0.95:
             ...     print(f"Visual change detected: {diff['diff_percentage']}%")
         """
+        return self._compare_images(baseline_path, current_path, save_diff)
+    
+    
+    def _compare_images(
+        self,
+        baseline_path: str,
+        current_path: str,
+        save_diff: bool,
+        diff_map_below: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        compare_images, optionally saving the diff map only for pairs whose
+        similarity is below diff_map_below (one pixel pass either way).
+        
+        Results with a diff map are cached as save_diff=True results, the
+        others as save_diff=False results.
+        """
+        # One clock read per call, reused for the diff map name and timestamp
+        now = datetime.now()
         try:
-            # Load images
-            baseline = Image.open(baseline_path).convert('RGB')
-            current = Image.open(current_path).convert('RGB')
+            backend = self.image_backend
+            baseline_key = _file_key(baseline_path)
+            current_key = _file_key(current_path)
             
-            # Ensure same size
-            if baseline.size != current.size:
-                current = current.resize(baseline.size, Image.Resampling.LANCZOS)
+            # Unchanged files -> reuse the previous result (and its diff map)
+            file_pair = (baseline_key, current_key, backend)
+            cached = self._cached_result(file_pair, save_diff)
+            if cached is None and save_diff and diff_map_below is not None:
+                # A map-less result will do if the map would not be saved anyway
+                cached = self._cached_result(file_pair, False)
+                if cached is not None and cached["similarity"] < diff_map_below:
+                    cached = None
+            if cached is not None:
+                return cached
             
-            # Calculate pixel difference
-            diff_img = ImageChops.difference(baseline, current)
-            diff_array = np.array(diff_img)
+            # Load images (OpenCV decodes straight to BGR ndarray)
+            _load_image_libs()
+            baseline_array = _load_image_array(baseline_path, baseline_key, backend)
+            current_array = _load_image_array(current_path, current_key, backend)
             
-            # Calculate metrics
-            total_pixels = diff_array.size // 3  # RGB channels
-            diff_pixels = np.count_nonzero(diff_array)
-            diff_percentage = (diff_pixels / (total_pixels * 3)) * 100
-            similarity = 1.0 - (diff_percentage / 100.0)
+            # Ensure same size
+            if baseline_array.shape != current_array.shape:
+                current_array = _resize_image_array(current_array, baseline_array.shape, backend)
+            baseline_size = current_size = (baseline_array.shape[1], baseline_array.shape[0])
             
-            # Detect changed regions (simplified bounding boxes)
-            regions = self._detect_changed_regions(diff_array)
+            # Single pipeline over the decoded arrays
+            similarity, diff_pixels, diff_percentage, regions, diff_enhanced = (
+                self._analyze_arrays(baseline_array, current_array, save_diff, diff_map_below)
+            )
+            result_key = file_pair + (diff_enhanced is not None,)
             
             # Save diff map
             diff_map_path = None
-            if save_diff:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                diff_map_path = str(self.cache_dir / f"diff_{timestamp}.png")
+            if diff_enhanced is not None:
+                timestamp = now.strftime("%Y%m%d_%H%M%S")
+                # Pair digest keeps same-second comparisons from sharing a file
+                pair_digest = self._get_cache_key(*result_key)[:8]
+                diff_map_path = str(self.cache_dir / f"diff_{timestamp}_{pair_digest}.png")
                 
-                # Enhance diff for visibility
-                diff_enhanced = diff_img.point(lambda x: x * 5)  # Amplify differences
-                diff_enhanced.save(diff_map_path)
+                # The map is a debug artifact: PNG level 1 is several times
+                # faster to encode than the default 6 for slightly larger files.
+                # Encoded in the background - readers call wait_for_diff_map()
+                if backend == "cv2":
+                    _write_in_background(
+                        diff_map_path, cv2.imwrite,
+                        diff_map_path, diff_enhanced, [cv2.IMWRITE_PNG_COMPRESSION, 1]
+                    )
+                else:
+                    _write_in_background(
+                        diff_map_path, Image.fromarray(diff_enhanced).save,
+                        diff_map_path, optimize=False, compress_level=1
+                    )
             
-            return {
+            result = {
                 "similarity": round(similarity, 4),
                 "diff_pixels": int(diff_pixels),
                 "diff_percentage": round(diff_percentage, 2),
                 "regions": regions,
                 "diff_map_path": diff_map_path,
-                "baseline_size": baseline.size,
-                "current_size": current.size,
-                "timestamp": datetime.now().isoformat()
+                "baseline_size": baseline_size,
+                "current_size": current_size,
+                "timestamp": now.isoformat()
             }
             
+            self._remember_result((result_key, _content_key(result_key)), result)
+            return result
+            
         except Exception as e:
             print(f"[Vision] ❌ Image comparison failed: {e}")
             return {
                 "similarity": 0.0,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
     
     
+    def _cached_result(self, file_pair: tuple, save_diff: bool) -> Optional[Dict[str, Any]]:
+        """
+        Previous compare_images result for these files, or for the same
+        pixels under another path/mtime (re-captured screenshots).
+        
+        Returns:
+            dict: Copy of the cached result, or None if there is none (or
+                  its diff map is missing)
+        """
+        result_key = file_pair + (save_diff,)
+        hit_key = result_key
+        cached = self._compare_cache.get(result_key)
+        if cached is None:
+            hit_key = _content_key(result_key)
+            cached = self._compare_cache.get(hit_key)
+        if cached is None or (save_diff and not self.wait_for_diff_map(cached["diff_map_path"])):
+            return None
+        self._compare_cache.move_to_end(hit_key)
+        if hit_key is not result_key:
+            self._compare_cache[result_key] = cached
+        return copy.deepcopy(cached)
+    
+    
+    def _remember_result(self, keys: tuple, result: Dict[str, Any]) -> None:
+        """Store a compare_images result under its file and content keys (LRU)."""
+        stored = copy.deepcopy(result)
+        for key in keys:
+            self._compare_cache[key] = stored
+        while len(self._compare_cache) > COMPARE_CACHE_MAX_ITEMS:
+            self._compare_cache.popitem(last=False)
+    
+    
+    def wait_for_diff_map(self, diff_map_path: Optional[str], timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a diff map from compare_images to be written to disk.
+        
+        compare_images returns as soon as the diff is computed and encodes
+        the PNG in the background; call this before opening the file.
+        
+        Args:
+            diff_map_path (str): "diff_map_path" from a compare_images result
+            timeout (float): Maximum seconds to wait (None = no limit)
+            
+        Returns:
+            bool: True if the diff map exists on disk
+        """
+        if not diff_map_path:
+            return False
+        return _wait_for_pending_write(diff_map_path, timeout) and os.path.exists(diff_map_path)
+    
+    
+    def _analyze_arrays(
+        self,
+        baseline_array: np.ndarray,
+        current_array: np.ndarray,
+        save_diff: bool = False,
+        diff_map_below: Optional[float] = None
+    ) -> tuple:
+        """
+        Compute all pixel metrics for two decoded images of equal shape.
+        
+        The fused kernel yields count and bbox in one pass; the full diff
+        array is only materialised when regions need labelling (OpenCV)
+        or a diff map is requested, and is then shared by both.
+        
+        Args:
+            baseline_array (np.ndarray): H x W x 3 uint8 baseline
+            current_array (np.ndarray): H x W x 3 uint8 current (same shape)
+            save_diff (bool): Also build the amplified diff map
+            diff_map_below (float): Only build it when similarity is below this
+            
+        Returns:
+            tuple: (similarity, diff_pixels, diff_percentage, regions,
+                    enhanced diff array or None)
+        """
+        # Pixel difference, count and changed bounding box in one pass
+        diff_pixels, changed_pixels, rmin, rmax, cmin, cmax = _diff_and_bbox(
+            baseline_array, current_array, REGION_THRESHOLD
+        )
+        
+        # Calculate metrics
+        total_pixels = baseline_array.shape[0] * baseline_array.shape[1]
+        diff_percentage = (diff_pixels / (total_pixels * 3)) * 100
+        similarity = 1.0 - (diff_percentage / 100.0)
+        
+        # Changed regions - one box per connected area with OpenCV,
+        # otherwise a single box around all changes
+        diff_array = None
+        if cv2 is not None and rmax >= 0:
+            diff_array = cv2.absdiff(baseline_array, current_array)
+            regions = self._detect_changed_regions(diff_array)
+        else:
+            regions = _bbox_regions(rmin, rmax, cmin, cmax, changed_pixels)
+        
+        # Enhance diff for visibility (only when a map will be saved)
+        diff_enhanced = None
+        if save_diff and (diff_map_below is None or similarity < diff_map_below):
+            if diff_array is None:
+                diff_array = (
+                    np.maximum(baseline_array, current_array)
+                    - np.minimum(baseline_array, current_array)
+                )
+            # Amplify differences x5, saturating at 255
+            diff_enhanced = np.minimum(diff_array.astype(np.uint16) * 5, 255).astype(np.uint8)
+        
+        return similarity, int(diff_pixels), diff_percentage, regions, diff_enhanced
+    
+    
     def _detect_changed_regions(
         self,
         diff_array: np.ndarray,
-        threshold: int = 30
+        threshold: int = REGION_THRESHOLD
     ) -> List[Dict[str, int]]:
         """
         Detect bounding boxes of changed regions in diff array.
         
+        With OpenCV installed each 8-connected changed area gets its own box
+        (largest first); otherwise a single box covers all changes. Either
+        way "area" is the changed pixel count and width/height are inclusive.
+        
         Args:
             diff_array (np.ndarray): NumPy array of diff image
             threshold (int): Minimum pixel difference to consider
@@ -227,14 +850,21 @@ class VisionAnalyzer:
         Returns:
             list: List of region dicts with x, y, width, height
         """
-        # Convert to grayscale for simpler processing
+        _load_image_libs()
+        
+        # Find pixels above threshold. Integer channel sum vs. scaled
+        # threshold is exactly mean > threshold without a float64 H x W copy
         if len(diff_array.shape) == 3:
-            diff_gray = np.mean(diff_array, axis=2)
+            channel_sum = diff_array.sum(axis=2, dtype=np.uint16)
+            changed_mask = channel_sum > threshold * diff_array.shape[2]
         else:
-            diff_gray = diff_array
+            changed_mask = diff_array > threshold
         
-        # Find pixels above threshold
-        changed_mask = diff_gray > threshold
+        # Per-area boxes when OpenCV is available
+        if cv2 is not None:
+            regions = _component_regions(changed_mask)
+            if regions or not changed_mask.any():
+                return regions
         
         # Find bounding box of all changes (simplified)
         rows = np.any(changed_mask, axis=1)
@@ -246,13 +876,7 @@ class VisionAnalyzer:
         rmin, rmax = np.where(rows)[0][[0, -1]]
         cmin, cmax = np.where(cols)[0][[0, -1]]
         
-        return [{
-            "x": int(cmin),
-            "y": int(rmin),
-            "width": int(cmax - cmin),
-            "height": int(rmax - rmin),
-            "area": "full_diff"
-        }]
+        return _bbox_regions(rmin, rmax, cmin, cmax, np.count_nonzero(changed_mask))
     
     
     def detect_visual_anomalies(
@@ -289,8 +913,8 @@ class VisionAnalyzer:
             >>> if anomalies:
             ...     print(f"Found {len(anomalies)} visual anomalies")
         """
-        # Compare images
-        diff = self.compare_images(baseline_path, current_path, save_diff=True)
+        # Compare images - the diff map is only written for anomalous pairs
+        diff = self._compare_images(baseline_path, current_path, save_diff=True, diff_map_below=threshold)
         
         # Check if similarity is below threshold
         if diff.get("similarity", 1.0) >= threshold:
@@ -364,8 +988,15 @@ class VisionAnalyzer:
                 "description": "Vision LLM analysis disabled"
             }
         
-        # Check cache
-        cache_key = self._get_cache_key(image_path, prompt)
+        # Diff maps may still be encoding in the background
+        _wait_for_pending_write(image_path)
+        
+        # Check cache (mtime invalidates entries when the image is rewritten)
+        try:
+            image_mtime = os.path.getmtime(image_path)
+        except OSError:
+            image_mtime = None
+        cache_key = self._get_cache_key(image_path, image_mtime, prompt)
         if use_cache and cache_key in self.cache:
             print(f"[Vision] ✅ Cache hit for LLM analysis")
             return self.cache[cache_key]
@@ -407,7 +1038,7 @@ Return your analysis in a structured format."""
             # Cache result
             if use_cache:
                 self.cache[cache_key] = result
-                self._save_cache()
+                self._append_cache_entry(cache_key, result)
             
             return result
             
@@ -421,16 +1052,8 @@ Return your analysis in a structured format."""
     
     def _extract_elements(self, llm_response: str) -> List[str]:
         """Extract element names from LLM response."""
-        # Simple heuristic: look for common element keywords
-        keywords = ["button", "input", "link", "text", "image", "form", "menu", "nav"]
-        elements = []
-        
-        response_lower = llm_response.lower()
-        for keyword in keywords:
-            if keyword in response_lower:
-                elements.append(keyword)
-        
-        return list(set(elements))  # Unique elements
+        # Simple heuristic: look for common element keywords in a single pass
+        return list({match.group(1).lower() for match in _ELEMENT_RE.finditer(llm_response)})
     
     
     def _extract_action(self, llm_response: str) -> str:
@@ -476,7 +1099,7 @@ Return your analysis in a structured format."""
         primary_diff = visual_diffs[0]
         diff_map_path = primary_diff.get("diff_map_path")
         
-        if not diff_map_path or not os.path.exists(diff_map_path):
+        if not self.wait_for_diff_map(diff_map_path):
             return None
         
         # Analyze with LLM
@@ -518,5 +1141,5 @@ Suggest a robust locator strategy (CSS, XPath, or text-based) that would work wi
         return {
             "cache_size": len(self.cache),
             "cache_file": str(self.cache_file),
-            "cache_keys": list(self.cache.keys())[:10]  # First 10 keys
+            "cache_keys": list(islice(self.cache, 10))  # First 10 keys
         }
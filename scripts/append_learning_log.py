@@ -12,20 +12,20 @@ def append_entry(title: str, why: str, files: list[str], result: str):
     guide = Path(__file__).resolve().parents[1] / "LEARNING_GUIDE.md"
     # Use timezone-aware UTC timestamp to avoid deprecation warnings
     ts = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    entry = [
-        "\n---\n",
-        f"### Change: {title}\n",
-        f"- Timestamp: {ts} UTC\n",
-        f"- Why: {why}\n",
-        "- Files changed:\n",
-    ]
-    for f in files:
-        entry.append(f"  - {f}\n")
-    entry.append(f"- Test result: {result}\n")
-    entry.append("\n")
+    files_block = "".join(f"  - {f}\n" for f in files)
+    body = (
+        "\n---\n"
+        f"### Change: {title}\n"
+        f"- Timestamp: {ts} UTC\n"
+        f"- Why: {why}\n"
+        "- Files changed:\n"
+        f"{files_block}"
+        f"- Test result: {result}\n"
+        "\n"
+    )
 
     with open(guide, "a", encoding="utf-8") as fh:
-        fh.writelines(entry)
+        fh.write(body)
     print(f"Appended change entry to {guide}")
 
 
@@ -5,6 +5,7 @@ Test prompt: "playwright automation testing using AI in summary minimum words"
 
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from ai_gateway import AIGateway
 
@@ -16,6 +17,33 @@ PROMPT = "playwright automation testing using AI in summary minimum words"
 # Providers to test
 PROVIDERS = ["groq", "openrouter", "gemini", "openai"]
 
+# API key required by each provider
+KEY_MAP = {
+    "groq": "GROQ_API_KEY",
+    "openrouter": "OPENROUTER_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY"
+}
+
+
+def bench(provider: str) -> dict:
+    """Send PROMPT to one provider and time the response."""
+    # Provider passed explicitly - AI_PROVIDER env is shared across threads
+    gateway = AIGateway(provider=provider)
+    
+    # Measure response time
+    start_time = time.perf_counter()
+    response = gateway.ask(PROMPT)
+    duration = time.perf_counter() - start_time
+    
+    return {
+        "provider": provider,
+        "response": response,
+        "time": duration,
+        "word_count": len(response.split())
+    }
+
+
 print("=" * 80)
 print("🧪 AI PROVIDER COMPARISON TEST")
 print("=" * 80)
@@ -25,52 +53,44 @@ print()
 
 results = []
 
+available = []
 for provider in PROVIDERS:
     # Check if provider has API key
-    key_map = {
-        "groq": "GROQ_API_KEY",
-        "openrouter": "OPENROUTER_API_KEY",
-        "gemini": "GEMINI_API_KEY",
-        "openai": "OPENAI_API_KEY"
-    }
-    
-    if not os.getenv(key_map[provider]):
+    if not os.getenv(KEY_MAP[provider]):
         print(f"❌ {provider.upper()}: API key not found, skipping...")
         print()
         continue
+    available.append(provider)
+
+# Requests are network-bound and independent - wall time is the slowest
+# provider instead of the sum of all of them
+if available:
+    print(f"🔄 Testing {', '.join(p.upper() for p in available)} in parallel...")
+    print()
     
-    print(f"🔄 Testing {provider.upper()}...")
-    print("-" * 80)
-    
-    try:
-        # Set the provider via environment variable
-        os.environ["AI_PROVIDER"] = provider
-        gateway = AIGateway()
-        
-        # Measure response time
-        start_time = time.time()
-        response = gateway.ask(PROMPT)
-        end_time = time.time()
-        
-        duration = end_time - start_time
+    with ThreadPoolExecutor(max_workers=len(available)) as executor:
+        futures = {executor.submit(bench, provider): provider for provider in available}
         
-        # Store results
-        results.append({
-            "provider": provider,
-            "response": response,
-            "time": duration,
-            "word_count": len(response.split())
-        })
-        
-        print(f"⏱️  Response Time: {duration:.2f} seconds")
-        print(f"📝 Word Count: {len(response.split())} words")
-        print(f"💬 Response:")
-        print(response)
-        print()
-        
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        print()
+        for future in as_completed(futures):
+            provider = futures[future]
+            print(f"📥 {provider.upper()}")
+            print("-" * 80)
+            
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ Error: {str(e)}")
+                print()
+                continue
+            
+            # Store results
+            results.append(result)
+            
+            print(f"⏱️  Response Time: {result['time']:.2f} seconds")
+            print(f"📝 Word Count: {result['word_count']} words")
+            print(f"💬 Response:")
+            print(result["response"])
+            print()
 
 # Summary
 print("=" * 80)
@@ -18,12 +18,12 @@ Usage:
 """
 
 from pathlib import Path
-import subprocess
 import sys
 
-# Add service to path
+# Add service to path (once - re-imports must not grow sys.path)
 SERVICE_DIR = Path(__file__).parent
-sys.path.insert(0, str(SERVICE_DIR))
+if str(SERVICE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICE_DIR))
 
 
 def run_security_scan() -> int:
@@ -33,9 +33,9 @@ def run_security_scan() -> int:
     Returns:
         0 if safe, 1 if sensitive data detected
     """
-    scanner_path = SERVICE_DIR / "check_private_data.py"
-    result = subprocess.run([sys.executable, str(scanner_path)])
-    return result.returncode
+    # In-process: no interpreter start-up or re-import per scan
+    from . import check_private_data
+    return check_private_data.main()
 
 
 def install_hooks() -> int:
@@ -45,9 +45,8 @@ def install_hooks() -> int:
     Returns:
         0 if successful
     """
-    installer_path = SERVICE_DIR / "install_git_hooks.py"
-    result = subprocess.run([sys.executable, str(installer_path)])
-    return result.returncode
+    from . import install_git_hooks
+    return install_git_hooks.main()
 
 
 __all__ = ['run_security_scan', 'install_hooks']
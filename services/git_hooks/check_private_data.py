@@ -20,32 +20,193 @@ Returns:
     Exit code 1: DANGER! Sensitive data detected
 """
 
+import fnmatch
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Tuple
+
+# Optional: google-re2 matches in linear time (no catastrophic backtracking)
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Optional: Hyperscan screens a whole file in one SIMD pass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 
 # Patterns for sensitive data detection
+# (runs that precede a required suffix are length-capped so a long
+# non-matching line such as minified JS cannot make the backtracking engine go
+# quadratic; caps stay within RE2's 1000 repetition limit)
 SENSITIVE_PATTERNS = {
     "OpenAI API Key": r"sk-[a-zA-Z0-9]{48,}",
     "Groq API Key": r"gsk_[a-zA-Z0-9]{52,}",
     "Gemini API Key": r"AIzaSy[a-zA-Z0-9_-]{33,}",
     "OpenRouter API Key": r"sk-or-v1-[a-f0-9]{64,}",
     "HuggingFace Token": r"hf_[a-zA-Z0-9]{34,}",
-    "Generic API Key": r"(?i)(api[_-]?key|apikey|api[_-]?secret)[\s]*[=:][\s]*['\"]?([a-zA-Z0-9_\-]{20,})['\"]?",
+    "Generic API Key": r"(?i)(api[_-]?key|apikey|api[_-]?secret)[\s]{0,16}[=:][\s]{0,16}['\"]?([a-zA-Z0-9_\-]{20,})['\"]?",
     "AWS Access Key": r"AKIA[0-9A-Z]{16}",
     "AWS Secret Key": r"(?i)aws[_-]?secret[_-]?access[_-]?key[\s]*[=:][\s]*['\"]?([a-zA-Z0-9/+=]{40})['\"]?",
-    "Generic Secret": r"(?i)(secret|password|passwd|pwd)[\s]*[=:][\s]*['\"]([^'\"]{8,})['\"]",
+    "Generic Secret": r"(?i)(secret|password|passwd|pwd)[\s]{0,16}[=:][\s]{0,16}['\"]([^'\"]{8,1000})['\"]",
     "Private Key": r"-----BEGIN (RSA |DSA |EC )?PRIVATE KEY-----",
     "SSH Key": r"ssh-rsa AAAA[0-9A-Za-z+/]+",
-    "Bearer Token": r"(?i)bearer[\s]+[a-zA-Z0-9\-._~+/]+=*",
-    "Email Address": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    "Bearer Token": r"(?i)bearer[\s]{1,16}[a-zA-Z0-9\-._~+/]{1,1000}=*",
+    "Email Address": r"[a-zA-Z0-9._%+-]{1,64}@[a-zA-Z0-9.-]{1,255}\.[a-zA-Z]{2,24}",
     "Private IP": r"\b(10\.\d{1,3}\.\d{1,3}\.\d{1,3}|172\.(1[6-9]|2[0-9]|3[0-1])\.\d{1,3}\.\d{1,3}|192\.168\.\d{1,3}\.\d{1,3})\b",
     "Credit Card": r"\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|3[47][0-9]{13}|3(?:0[0-5]|[68][0-9])[0-9]{11}|6(?:011|5[0-9]{2})[0-9]{12}|(?:2131|1800|35\d{3})\d{11})\b",
     "JWT Token": r"eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9._-]{10,}",
 }
 
+# Patterns to ignore (placeholders, examples, documentation)
+IGNORE_PATTERNS = [
+    r"your_\w+_here",  # your_key_here, your_token_here
+    r"your[-_]?\w*[-_]?key",  # your-api-key, yourkey
+    r"example[_-]?\w*",  # example_key, example-token
+    r"test[_-]?\w*",  # test_key, test-api
+    r"demo[_-]?\w*",  # demo_key, demo-secret
+    r"placeholder",
+    r"xxx+",  # xxxx, xxxxxxx
+    r"sk-proj-[Xx]+",  # Masked OpenAI keys in docs
+    r"gsk_[Xx]+",  # Masked Groq keys
+]
+
+
+def _scoped(pattern: str) -> str:
+    """Turn a leading global (?i) into a scoped (?i:...) group so it can be alternated."""
+    return f"(?i:{pattern[4:]})" if pattern.startswith("(?i)") else pattern
+
+
+# RE2 DFA budget: the counted repetitions in the combined pattern exceed the
+# 8 MiB default, which silently drops RE2 back to its slower NFA
+RE2_MAX_MEM = 64 * 1024 * 1024
+
+
+def _compile(pattern: str):
+    """Compile with RE2 when installed, falling back to re for unsupported syntax."""
+    if re2 is not None:
+        try:
+            if hasattr(re2, "Options"):  # google-re2
+                options = re2.Options()
+                options.max_mem = RE2_MAX_MEM
+                return re2.compile(pattern, options)
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+
+# Compiled once at import - scan_file runs for every tracked file
+COMPILED_PATTERNS = [(name, _compile(pattern)) for name, pattern in SENSITIVE_PATTERNS.items()]
+
+# Literals every match of a pattern must contain (lower-case ones are
+# checked case-insensitively). A pattern whose literals are all absent from
+# a block is left out of its scan; Credit Card has no literal and is gated
+# on a 13-digit run instead
+PATTERN_HINTS = {
+    "OpenAI API Key": ("sk-",),
+    "Groq API Key": ("gsk_",),
+    "Gemini API Key": ("AIzaSy",),
+    "OpenRouter API Key": ("sk-or-v1-",),
+    "HuggingFace Token": ("hf_",),
+    "Generic API Key": ("api",),
+    "AWS Access Key": ("AKIA",),
+    "AWS Secret Key": ("aws",),
+    "Generic Secret": ("secret", "password", "passwd", "pwd"),
+    "Private Key": ("PRIVATE KEY-----",),
+    "SSH Key": ("ssh-rsa AAAA",),
+    "Bearer Token": ("bearer",),
+    "Email Address": ("@",),
+    "Private IP": ("10.", "172.", "192.168."),
+    "Credit Card": (),
+    "JWT Token": ("eyJ",),
+}
+# Case-insensitive hints as regexes, so screening never copies a lowered block
+_IGNORE_CASE_HINTS = {
+    name: re.compile("|".join(map(re.escape, literals)), re.IGNORECASE)
+    for name, literals in PATTERN_HINTS.items()
+    if literals and SENSITIVE_PATTERNS[name].startswith("(?i)")
+}
+_DIGIT_RUN = re.compile(r"\d{13}")
+
+
+def candidate_patterns(text: str) -> Tuple[str, ...]:
+    """Names of the patterns that can match somewhere in text (by PATTERN_HINTS)."""
+    names = []
+    for name, literals in PATTERN_HINTS.items():
+        if not literals:
+            found = _DIGIT_RUN.search(text) is not None
+        elif name in _IGNORE_CASE_HINTS:
+            found = _IGNORE_CASE_HINTS[name].search(text) is not None
+        else:
+            found = any(literal in text for literal in literals)
+        if found:
+            names.append(name)
+    return tuple(names)
+
+
+@lru_cache(maxsize=256)
+def combined_pattern(names: Tuple[str, ...]):
+    """
+    One alternation of the named patterns for RE2: a single pass tells whether
+    a line can contain any of their findings, which is false for almost every line.
+    """
+    return _compile("|".join(f"(?:{_scoped(SENSITIVE_PATTERNS[name])})" for name in names))
+
+IGNORE_PATTERN = re.compile("|".join(IGNORE_PATTERNS), re.IGNORECASE)
+
+
+def _build_hyperscan_db():
+    """Compile every pattern into one Hyperscan database (None if unavailable)."""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode() for pattern in SENSITIVE_PATTERNS.values()],
+            ids=list(range(len(SENSITIVE_PATTERNS))),
+            elements=len(SENSITIVE_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(SENSITIVE_PATTERNS),
+        )
+        return db
+    except Exception as e:
+        print(f"⚠️  Hyperscan unavailable ({e}), using regex scan only")
+        return None
+
+
+HYPERSCAN_DB = _build_hyperscan_db()
+
+
+def _stop_on_first_match(pattern_id, start, end, flags, context) -> bool:
+    """Hyperscan match handler: one hit is enough to need the full scan."""
+    return True
+
+
+def may_contain_secrets(data: bytes) -> bool:
+    """
+    Cheap whole-file screen before the per-line scan.
+    
+    Only ASCII files are screened: Hyperscan's \\d and \\b are ASCII-only,
+    while the re patterns are Unicode-aware.
+    
+    Returns:
+        False only if no pattern can match anywhere in data
+    """
+    if HYPERSCAN_DB is None or not data.isascii():
+        return True
+    try:
+        HYPERSCAN_DB.scan(data, match_event_handler=_stop_on_first_match)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
 # Files to always ignore (safe to have sensitive data or examples)
 SAFE_FILES = {
     ".env",           # Protected by .gitignore
@@ -76,6 +237,22 @@ SKIP_DIRS = {
     ".idea",
 }
 
+# Files are read and scanned in blocks of this size, cut at line ends, so
+# large files (vendored bundles, data dumps) are scanned in bounded memory
+SCAN_BLOCK_BYTES = 2 * 1024 * 1024
+
+# A line longer than a block (minified bundles) is cut mid-line instead. The
+# next block repeats the last 2x this many bytes: matches starting in the
+# final half are left to it, and the first half gives them their left context
+# (more than any capped pattern can span, so each match is found once)
+SCAN_OVERLAP_BYTES = 4096
+
+# A NUL byte in the first block marks a binary file
+BINARY_SNIFF_BYTES = 4096
+
+# Below this many files, worker start-up costs more than it saves
+PARALLEL_SCAN_MIN_FILES = 200
+
 # File extensions to check
 CHECK_EXTENSIONS = {
     ".py", ".js", ".ts", ".jsx", ".tsx",
@@ -85,107 +262,253 @@ CHECK_EXTENSIONS = {
 }
 
 
+# SAFE_FILES split once: exact names are a set lookup, globs are precompiled
+_SAFE_NAMES = frozenset(p for p in SAFE_FILES if not any(c in p for c in '*?['))
+_SAFE_GLOBS = [re.compile(fnmatch.translate(p)) for p in SAFE_FILES if p not in _SAFE_NAMES]
+
+
 def is_safe_file(file_path: Path) -> bool:
     """Check if file is in the safe list (should not be scanned)."""
-    return any(file_path.match(pattern) for pattern in SAFE_FILES)
+    name = file_path.name
+    return name in _SAFE_NAMES or any(glob.match(name) for glob in _SAFE_GLOBS)
 
 
 def should_skip_dir(dir_path: Path) -> bool:
     """Check if directory should be skipped."""
-    return any(part in SKIP_DIRS for part in dir_path.parts)
+    return not SKIP_DIRS.isdisjoint(dir_path.parts)
+
+
+@lru_cache(maxsize=4096)
+def is_ignored(text: str) -> bool:
+    """Check if matched text is a placeholder/example (memoized - placeholders repeat across docs)."""
+    return IGNORE_PATTERN.search(text) is not None
+
+
+def _count_lines(data: bytes) -> int:
+    """Line breaks in a block (\n, \r\n or a lone \r, as scan_file() normalizes them)."""
+    return data.count(b'\n') + data.count(b'\r') - data.count(b'\r\n')
 
 
 def scan_file(file_path: Path) -> List[Tuple[str, int, str, str]]:
     """
     Scan a single file for sensitive patterns.
     
+    Files larger than SCAN_BLOCK_BYTES are scanned block by block; blocks
+    end on a line break, except inside lines longer than a block, which are
+    cut with a SCAN_OVERLAP_BYTES overlap so no match is lost or repeated.
+    
     Returns:
         List of (pattern_name, line_number, matched_text, line_content)
     """
     findings = []
     
-    # Patterns to ignore (placeholders, examples, documentation)
-    IGNORE_PATTERNS = [
-        r"your_\w+_here",  # your_key_here, your_token_here
-        r"your[-_]?\w*[-_]?key",  # your-api-key, yourkey
-        r"example[_-]?\w*",  # example_key, example-token
-        r"test[_-]?\w*",  # test_key, test-api
-        r"demo[_-]?\w*",  # demo_key, demo-secret
-        r"placeholder",
-        r"xxx+",  # xxxx, xxxxxxx
-        r"sk-proj-[Xx]+",  # Masked OpenAI keys in docs
-        r"gsk_[Xx]+",  # Masked Groq keys
-    ]
-    
-    def is_ignored(text: str) -> bool:
-        """Check if matched text is a placeholder/example."""
-        text_lower = text.lower()
-        return any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in IGNORE_PATTERNS)
-    
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, start=1):
-                for pattern_name, pattern in SENSITIVE_PATTERNS.items():
-                    matches = re.finditer(pattern, line)
-                    for match in matches:
-                        matched_text = match.group(0)
-                        
-                        # Skip if it's a placeholder/example
-                        if is_ignored(matched_text):
-                            continue
-                        
-                        # Mask the sensitive data in output
-                        masked_text = matched_text[:8] + "..." + matched_text[-4:] if len(matched_text) > 12 else "***"
-                        
-                        findings.append((
-                            pattern_name,
-                            line_num,
-                            masked_text,
-                            line.strip()
-                        ))
+        with open(file_path, 'rb') as f:
+            data = f.read(SCAN_BLOCK_BYTES)
+            if b'\x00' in data[:BINARY_SNIFF_BYTES]:
+                return findings
+            
+            line_num, carry, head = 1, b'', 0
+            while data:
+                data = carry + data
+                more = f.read(SCAN_BLOCK_BYTES)
+                carry, tail = b'', 0
+                if more:
+                    # Hold back the unfinished last line for the next block,
+                    # or only an overlap of it once it outgrows a block
+                    cut = data.rfind(b'\n') + 1
+                    if len(data) - cut > SCAN_BLOCK_BYTES:
+                        tail = SCAN_OVERLAP_BYTES
+                        carry = data[-2 * tail:]
+                    else:
+                        data, carry = data[:cut], data[cut:]
+                if data:
+                    findings.extend(_scan_block(data, line_num, head, tail))
+                    if more:
+                        # Bytes carried as overlap are counted with the next block
+                        line_num += _count_lines(data[:len(data) - 2 * tail])
+                data, head = more, tail
     except Exception as e:
         print(f"⚠️  Warning: Could not read {file_path}: {e}")
     
     return findings
 
 
+def _normalized_text(data: bytes) -> str:
+    """Decode a block, with \r\n and lone \r line breaks turned into \n."""
+    text = data.decode('utf-8', errors='ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _scan_block(data: bytes, line_num: int, head: int = 0, tail: int = 0) -> List[Tuple[str, int, str, str]]:
+    """
+    Findings in one block of lines, numbered from line_num.
+    
+    Matches starting in the first `head` bytes (reported with the previous
+    block) or in the last `tail` bytes (reported with the next) are skipped.
+    """
+    if not may_contain_secrets(data):
+        return []
+    
+    text = _normalized_text(data)
+    names = candidate_patterns(text)
+    if not names:
+        return []
+    patterns = [(name, pattern) for name, pattern in COMPILED_PATTERNS if name in names]
+    report_from = len(_normalized_text(data[:head])) if head else 0
+    report_before = len(text) - len(_normalized_text(data[-tail:])) if tail else len(text)
+    
+    # RE2 screens for every pattern in one DFA pass. The backtracking re
+    # engine tries each alternative at every offset, which is slower than
+    # separate searches that can skip ahead to each pattern's literal prefix
+    combined = combined_pattern(names) if re2 is not None else None
+    if combined is None or isinstance(combined, re.Pattern):
+        screens = [(pattern, [(name, pattern)]) for name, pattern in patterns]
+    else:
+        screens = [(combined, patterns)]
+    
+    hits = []
+    for screen, screened in screens:
+        _scan_screen(text, line_num, screen, screened, report_from, report_before, hits)
+    
+    # Line order, then SENSITIVE_PATTERNS order within a line
+    order = {name: index for index, name in enumerate(SENSITIVE_PATTERNS)}
+    hits.sort(key=lambda finding: (finding[1], order[finding[0]]))
+    return hits
+
+
+def _scan_screen(text: str, line_num: int, screen, patterns, report_from: int, report_before: int, findings: list):
+    """
+    Report `patterns` on each line of text where `screen` has a hit.
+    
+    Jumps straight to lines holding a candidate instead of looping over
+    every line: any per-line match is also a buffer match at the same
+    offset, so the leftmost buffer hit never skips past one.
+    """
+    counted_to, pos = 0, 0
+    while True:
+        hit = screen.search(text, pos)
+        if hit is None:
+            break
+        line_start = text.rfind('\n', 0, hit.start()) + 1
+        line_end = text.find('\n', hit.start())
+        if line_end == -1:
+            line_end = len(text)
+        line_num += text.count('\n', counted_to, line_start)
+        counted_to = line_start
+        line = text[line_start:line_end]
+        
+        # Report per pattern, since one span may match several
+        for pattern_name, pattern in patterns:
+            for match in pattern.finditer(line):
+                if not report_from <= line_start + match.start() < report_before:
+                    continue  # reported with the previous or next block
+                matched_text = match.group(0)
+                
+                # Skip if it's a placeholder/example
+                if is_ignored(matched_text):
+                    continue
+                
+                # Mask the sensitive data in output
+                masked_text = matched_text[:8] + "..." + matched_text[-4:] if len(matched_text) > 12 else "***"
+                
+                findings.append((
+                    pattern_name,
+                    line_num,
+                    masked_text,
+                    line.strip()
+                ))
+        
+        pos = line_end + 1
+
+
+def scan_files(files: List[Path]) -> List[List[Tuple[str, int, str, str]]]:
+    """
+    Scan files for sensitive patterns, across processes for large repos.
+    
+    Regex matching is CPU-bound and every file is independent, so each
+    worker scans its own chunk of files.
+    
+    Returns:
+        scan_file() findings for each file, in input order
+    """
+    workers = os.cpu_count() or 1
+    if len(files) >= PARALLEL_SCAN_MIN_FILES and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(scan_file, files, chunksize=16))
+        except Exception as e:
+            print(f"⚠️  Parallel scan unavailable ({e}), scanning serially...")
+    return [scan_file(f) for f in files]
+
+
+def walk_project_files(root: Path) -> Iterator[str]:
+    """
+    Yield paths of checkable files under root, without descending into SKIP_DIRS.
+    
+    os.scandir entries carry the file type from the directory listing, so
+    no extra stat() is needed per file (unlike Path.rglob + is_file()).
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    if os.path.splitext(entry.name)[1] in CHECK_EXTENSIONS:
+                        yield entry.path
+
+
+# project_root -> (index mtime, files): re-listing is skipped until the index changes
+_tracked_files_cache: Dict[Path, Tuple[int, List[Path]]] = {}
+
+
 def get_git_tracked_files(project_root: Path) -> List[Path]:
     """Get list of files tracked by git or staged for commit."""
     import subprocess
     
+    # Staging rewrites .git/index, so its mtime invalidates the cached listing
     try:
-        # Get tracked files
-        result = subprocess.run(
-            ["git", "ls-files"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        tracked = result.stdout.strip().split('\n')
-        
-        # Get staged files (about to be committed)
+        index_mtime = (project_root / ".git" / "index").stat().st_mtime_ns
+    except OSError:
+        index_mtime = None
+    cached = _tracked_files_cache.get(project_root)
+    if cached is not None and index_mtime is not None and cached[0] == index_mtime:
+        return list(cached[1])
+    
+    try:
+        # The index holds tracked and staged files alike: one process,
+        # NUL-separated so names with spaces or newlines survive
         result = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"],
+            ["git", "ls-files", "-z"],
             cwd=project_root,
             capture_output=True,
-            text=True,
             check=True
         )
-        staged = result.stdout.strip().split('\n') if result.stdout.strip() else []
+        names = {name for name in result.stdout.decode('utf-8', errors='surrogateescape').split('\0') if name}
+        files = [project_root / name for name in names]
         
-        # Combine and deduplicate
-        all_files = set(tracked + staged)
-        return [project_root / f for f in all_files if f]
-        
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         # Fallback: scan all files if git commands fail
         print("⚠️  Git commands failed, scanning all files in project...")
-        return list(project_root.rglob('*'))
+        return [Path(path) for path in walk_project_files(project_root)]
+    
+    if index_mtime is not None:
+        _tracked_files_cache[project_root] = (index_mtime, files)
+    return list(files)
 
 
-def main():
-    """Main security scanning function."""
+def main() -> int:
+    """Main security scanning function (returns the process exit code)."""
     project_root = Path(__file__).resolve().parents[1]
     
     print("=" * 80)
@@ -209,8 +532,7 @@ def main():
     total_findings = []
     files_with_issues = {}
     
-    for file_path in files_to_scan:
-        findings = scan_file(file_path)
+    for file_path, findings in zip(files_to_scan, scan_files(files_to_scan)):
         if findings:
             relative_path = file_path.relative_to(project_root)
             files_with_issues[relative_path] = findings
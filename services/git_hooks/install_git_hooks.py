@@ -163,7 +163,7 @@ def install_hooks():
     return 0
 
 
-def main():
+def main() -> int:
     try:
         return install_hooks()
     except KeyboardInterrupt:
@@ -15,9 +15,20 @@ Default: groq
 """
 
 import os
+import json
+import base64
+import asyncio
+import hashlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
 import urllib3
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Silence InsecureRequestWarning for corporate networks when verify=False is used
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -37,8 +48,109 @@ try:
 except ImportError:
     genai = None
 
+# Optional: orjson parses streamed Ollama chunks and serializes payloads in C
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+def _json_body(payload: dict) -> bytes:
+    """Serialize a request payload (orjson if installed - much faster for image data URLs)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+@lru_cache(maxsize=8)
+def _encode_file_base64(path: str, mtime_ns: int, size: int) -> str:
+    """Read and base64-encode a file once per (path, mtime, size)."""
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
+def _encode_image_base64(path) -> str:
+    """
+    Base64-encode an image for a data URL.
+    
+    Repair retries resend the same screenshots, so encodings are cached;
+    a rewritten file has a new mtime/size and is re-encoded.
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+    return _encode_file_base64(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _map_images(fn, image_paths: list) -> list:
+    """
+    Apply fn to every image path, in parallel when there are several.
+    
+    File reads, PNG decoding and base64 all release the GIL, so before/after
+    screenshot pairs are prepared side by side. Order is preserved.
+    """
+    if len(image_paths) < 2:
+        return [fn(path) for path in image_paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(image_paths))) as executor:
+        return list(executor.map(fn, image_paths))
+
+
+def _load_pil_image(path):
+    """Open and fully decode an image (PIL.Image.open alone is lazy)."""
+    from PIL import Image as PILImage
+    img = PILImage.open(path)
+    img.load()
+    return img
+
 load_dotenv()
 
+# Identical prompts (repair retries, flaky-test reruns) reuse the last answer
+ASK_CACHE_MAX_ITEMS = 512
+ASK_ERROR_RESPONSE = "Error or rate limit reached."
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+# HTTP/2 lets concurrent async calls share one connection (needs the h2 package)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Shared HTTP session: keep-alive connections are reused across calls and
+# gateways, so only the first request to a host pays the TCP+TLS handshake
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _is_error_response(text: str) -> bool:
+    """Check for the gateway's error strings ("[OpenRouter Error] ...", etc.) - never cached."""
+    return text == ASK_ERROR_RESPONSE or (text.startswith("[") and "error]" in text[:40].lower())
+
+
+def _get_http_session() -> requests.Session:
+    """Get the shared pooled session (created on first use)."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                # Completions are POSTs and not idempotent: only retry when
+                # the request never reached the server (connect errors), not
+                # after a read timeout or 5xx that may already be billed
+                retry = Retry(
+                    total=3,
+                    connect=3,
+                    read=0,
+                    status=0,
+                    other=0,
+                    backoff_factor=0.3,
+                )
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
 
 class AIGateway:
     """
@@ -52,11 +164,14 @@ class AIGateway:
     AI_PROVIDER=openai      # 💰 Paid, high quality
     AI_PROVIDER=hf          # ⚠️ LOW PRIORITY - API deprecated, use only as last resort
     AI_PROVIDER=ollama      # 🏠 Requires local server: ollama serve
+    
+    Or pass it explicitly: AIGateway(provider="gemini") - lets several
+    gateways for different providers live side by side in one process.
     """
 
-    def __init__(self):
+    def __init__(self, provider: str = None):
         # Default to 'groq' if AI_PROVIDER not set (fastest, most reliable free option)
-        self.provider = os.getenv("AI_PROVIDER", "groq").lower()
+        self.provider = (provider or os.getenv("AI_PROVIDER", "groq")).lower()
         print(f"[INFO] Active AI provider: {self.provider}")
 
         self.openai_key = os.getenv("OPENAI_API_KEY")
@@ -65,6 +180,13 @@ class AIGateway:
         self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
         self.hf_key = os.getenv("HF_API_KEY")
 
+        # Prompt digest -> response (LRU); digests avoid holding large prompts
+        self._ask_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._ask_cache_lock = threading.Lock()
+
+        # httpx.AsyncClient for ask_async (created on first use, in the caller's loop)
+        self._async_http = None
+
         if self.provider == "openai" and self.openai_key:
             if OpenAI is None:
                 raise ImportError("OpenAI package not installed. Run: pip install openai")
@@ -79,6 +201,13 @@ class AIGateway:
 
         elif self.provider == "openrouter" and self.openrouter_key:
             self.client = None
+            # Static for the gateway's lifetime - built once, not per call
+            self._openrouter_headers = {
+                "Authorization": f"Bearer {self.openrouter_key}",
+                "HTTP-Referer": "http://localhost",
+                "X-Title": "AI-TestOps-Gateway",
+                "Content-Type": "application/json",
+            }
 
         elif self.provider == "gemini" and self.gemini_key:
             if genai is None:
@@ -98,7 +227,105 @@ class AIGateway:
                 "Please check your .env configuration."
             )
 
-    def ask(self, prompt: str) -> str:
+    def ask(self, prompt: str, allow_cache: bool = True) -> str:
+        """
+        Send a text prompt to the active provider.
+        
+        Args:
+            prompt (str): Prompt text
+            allow_cache (bool): Reuse the answer to an identical earlier prompt
+                (pass False for prompts that must hit the model every time)
+                
+        Returns:
+            str: Model response, or an error string
+        """
+        if not allow_cache:
+            return self._ask_provider(prompt)
+        
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        response = self._ask_provider(prompt)
+        self._cache_put(key, response)
+        return response
+
+    async def ask_async(self, prompt: str, allow_cache: bool = True) -> str:
+        """
+        Async variant of ask() for the FastAPI layer.
+        
+        OpenRouter and Ollama are called natively through httpx.AsyncClient;
+        SDK-based providers (Groq, OpenAI, Gemini) run ask() in a worker thread.
+        Shares ask()'s prompt cache.
+        
+        Args:
+            prompt (str): Prompt text
+            allow_cache (bool): Reuse the answer to an identical earlier prompt
+                
+        Returns:
+            str: Model response, or an error string
+        """
+        if self.provider not in ("openrouter", "ollama"):
+            return await asyncio.to_thread(self.ask, prompt, allow_cache)
+        
+        key = self._cache_key(prompt) if allow_cache else None
+        if key is not None:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+        
+        try:
+            if self.provider == "openrouter":
+                response = await self._ask_openrouter_async(prompt)
+            else:
+                response = await self._ask_ollama_async(prompt)
+        except Exception as e:
+            print(f"[ERROR] LLM request failed: {e}")
+            return ASK_ERROR_RESPONSE
+        
+        if key is not None:
+            self._cache_put(key, response)
+        return response
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client (call on application shutdown)."""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+
+    @staticmethod
+    def _cache_key(prompt: str) -> bytes:
+        return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes):
+        with self._ask_cache_lock:
+            cached = self._ask_cache.get(key)
+            if cached is not None:
+                self._ask_cache.move_to_end(key)
+            return cached
+
+    def _cache_put(self, key: bytes, response) -> None:
+        if not isinstance(response, str) or _is_error_response(response):
+            return
+        with self._ask_cache_lock:
+            self._ask_cache[key] = response
+            while len(self._ask_cache) > ASK_CACHE_MAX_ITEMS:
+                self._ask_cache.popitem(last=False)
+
+    def _get_async_http(self):
+        """Get this gateway's pooled async client (created on first use)."""
+        if self._async_http is None:
+            import httpx
+            self._async_http = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                verify=False,
+                timeout=60,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            )
+        return self._async_http
+
+    def _ask_provider(self, prompt: str) -> str:
         try:
             if self.provider == "openai":
                 return self._ask_openai(prompt)
@@ -116,7 +343,7 @@ class AIGateway:
                 raise ValueError("Unsupported AI provider.")
         except Exception as e:
             print(f"[ERROR] LLM request failed: {e}")
-            return "Error or rate limit reached."
+            return ASK_ERROR_RESPONSE
     
     def ask_vision(self, image_paths: list, question: str) -> str:
         """
@@ -172,24 +399,34 @@ class AIGateway:
 
     def _ask_openrouter(self, prompt: str) -> str:
         """Call DeepSeek (or any) model via OpenRouter API."""
-        url = "https://openrouter.ai/api/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.openrouter_key}",
-            "HTTP-Referer": "http://localhost",
-            "X-Title": "AI-TestOps-Gateway",
-            "Content-Type": "application/json",
-        }
         payload = {
             "model": "deepseek/deepseek-chat",
             "messages": [{"role": "user", "content": prompt}],
         }
 
-        resp = requests.post(url, headers=headers, json=payload, timeout=60, verify=False)
+        resp = _get_http_session().post(
+            OPENROUTER_URL, headers=self._openrouter_headers, data=_json_body(payload), timeout=60, verify=False
+        )
         if resp.status_code != 200:
             return f"[OpenRouter Error] {resp.status_code}: {resp.text[:200]}"
         data = resp.json()
         return data["choices"][0]["message"]["content"].strip()
 
+    async def _ask_openrouter_async(self, prompt: str) -> str:
+        """Async _ask_openrouter on the shared httpx.AsyncClient."""
+        payload = {
+            "model": "deepseek/deepseek-chat",
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+        resp = await self._get_async_http().post(
+            OPENROUTER_URL, headers=self._openrouter_headers, content=_json_body(payload)
+        )
+        if resp.status_code != 200:
+            return f"[OpenRouter Error] {resp.status_code}: {resp.text[:200]}"
+        data = _json_loads(resp.content)
+        return data["choices"][0]["message"]["content"].strip()
+
     def _ask_gemini(self, prompt: str) -> str:
         model = genai.GenerativeModel("gemini-2.5-flash")
         response = model.generate_content(prompt)
@@ -198,36 +435,56 @@ class AIGateway:
     def _ask_ollama(self, prompt: str) -> str:
         try:
             payload = {"model": "llama3", "prompt": prompt}
-            response = requests.post(
-                "http://localhost:11434/api/generate",
+            response = _get_http_session().post(
+                OLLAMA_URL,
                 json=payload,
+                headers={"Accept": "application/json"},
                 stream=True,
                 timeout=180,
             )
-            full_text = ""
-            for line in response.iter_lines():
-                if line:
-                    chunk = line.decode("utf-8")
-                    if '"response":"' in chunk:
-                        full_text += chunk.split('"response":"')[1].split('"')[0]
-            return full_text.strip()
+            # Each streamed line is one JSON object: {"response": "...", "done": false}
+            parts = []
+            for line in response.iter_lines(chunk_size=8192):
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                parts.append(chunk.get("response", ""))
+                if chunk.get("done"):
+                    break
+            return "".join(parts).strip()
+        except Exception as e:
+            return f"[Ollama error] {e}"
+
+    async def _ask_ollama_async(self, prompt: str) -> str:
+        """Async _ask_ollama: streams the JSON lines without blocking the loop."""
+        try:
+            payload = {"model": "llama3", "prompt": prompt}
+            parts = []
+            async with self._get_async_http().stream(
+                "POST",
+                OLLAMA_URL,
+                content=_json_body(payload),
+                headers={"Accept": "application/json", "Content-Type": "application/json"},
+                timeout=180,
+            ) as response:
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    parts.append(chunk.get("response", ""))
+                    if chunk.get("done"):
+                        break
+            return "".join(parts).strip()
         except Exception as e:
             return f"[Ollama error] {e}"
     
     def _ask_gemini_vision(self, image_paths: list, question: str) -> str:
         """Call Gemini Vision API with images."""
-        import base64
-        from PIL import Image as PILImage
-        
         try:
             model = genai.GenerativeModel("gemini-2.0-flash-exp")
             
-            # Prepare images
-            image_parts = []
-            for img_path in image_paths:
-                # Load and encode image
-                img = PILImage.open(img_path)
-                image_parts.append(img)
+            # Prepare images (decoded concurrently)
+            image_parts = _map_images(_load_pil_image, image_paths)
             
             # Create prompt parts
             prompt_parts = [question] + image_parts
@@ -242,20 +499,17 @@ class AIGateway:
     
     def _ask_openai_vision(self, image_paths: list, question: str) -> str:
         """Call OpenAI GPT-4 Vision API with images."""
-        import base64
-        
         try:
-            # Encode images to base64
-            image_contents = []
-            for img_path in image_paths:
-                with open(img_path, "rb") as img_file:
-                    base64_image = base64.b64encode(img_file.read()).decode('utf-8')
-                    image_contents.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{base64_image}"
-                        }
-                    })
+            # Encode images to base64 (concurrently)
+            image_contents = [
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/png;base64,{base64_image}"
+                    }
+                }
+                for base64_image in _map_images(_encode_image_base64, image_paths)
+            ]
             
             # Build messages
             messages = [{
@@ -280,20 +534,10 @@ class AIGateway:
     
     def _ask_openrouter_vision(self, image_paths: list, question: str) -> str:
         """Call vision models via OpenRouter."""
-        import base64
-        
         try:
             # Encode first image
-            with open(image_paths[0], "rb") as img_file:
-                base64_image = base64.b64encode(img_file.read()).decode('utf-8')
+            base64_image = _encode_image_base64(image_paths[0])
             
-            url = "https://openrouter.ai/api/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.openrouter_key}",
-                "HTTP-Referer": "http://localhost",
-                "X-Title": "AI-TestOps-Gateway",
-                "Content-Type": "application/json",
-            }
             payload = {
                 "model": "google/gemini-2.0-flash-exp:free",  # Vision-capable model
                 "messages": [{
@@ -310,7 +554,9 @@ class AIGateway:
                 }],
             }
             
-            resp = requests.post(url, headers=headers, json=payload, timeout=60, verify=False)
+            resp = _get_http_session().post(
+                OPENROUTER_URL, headers=self._openrouter_headers, data=_json_body(payload), timeout=60, verify=False
+            )
             if resp.status_code != 200:
                 return f"[OpenRouter Vision Error] {resp.status_code}: {resp.text[:200]}"
             data = resp.json()
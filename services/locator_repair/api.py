@@ -29,13 +29,22 @@ Usage:
       }'
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hashlib
+import zlib
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Literal, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, Optional
 import uvicorn
 
-from .repair_service import LocatorRepairService, RepairResponse
+from .repair_service import LocatorRepairService, RepairRequest, RepairResponse
 
 
 # ============================================================================
@@ -64,15 +73,14 @@ class RepairRequestAPI(BaseModel):
         max_length=500
     )
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "framework": "playwright",
-                "page_source": "<html><button id='submit'>Submit</button></html>",
-                "failed_locator": "button#wrong_id",
-                "context_hint": "Submit button"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "framework": "playwright",
+            "page_source": "<html><button id='submit'>Submit</button></html>",
+            "failed_locator": "button#wrong_id",
+            "context_hint": "Submit button"
         }
+    })
 
 
 class RepairResponseAPI(BaseModel):
@@ -83,20 +91,37 @@ class RepairResponseAPI(BaseModel):
     framework: str
     confidence: str
     timestamp: str
+    timestamp_ns: Optional[int] = None
     error: Optional[str] = None
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "original_locator": "button#wrong_id",
-                "repaired_locator": "button#submit",
-                "framework": "playwright",
-                "confidence": "high",
-                "timestamp": "2025-11-11T12:00:00.000000",
-                "error": None
-            }
+    # from_attributes: validated straight from the service's RepairResponse
+    model_config = ConfigDict(from_attributes=True, json_schema_extra={
+        "example": {
+            "success": True,
+            "original_locator": "button#wrong_id",
+            "repaired_locator": "button#submit",
+            "framework": "playwright",
+            "confidence": "high",
+            "timestamp": "2025-11-11T12:00:00.000000+00:00",
+            "timestamp_ns": 1762862400000000000,
+            "error": None
         }
+    })
+
+
+class RepairBatchRequestAPI(BaseModel):
+    """API request model for repairing several locators in one call."""
+    items: List[RepairRequestAPI] = Field(
+        ...,
+        description="Locators to repair",
+        min_length=1,
+        max_length=50  # Limit to prevent abuse
+    )
+
+
+class RepairBatchResponseAPI(BaseModel):
+    """API response model for batch locator repair (results in request order)."""
+    results: List[RepairResponseAPI]
 
 
 class HealthResponse(BaseModel):
@@ -106,11 +131,84 @@ class HealthResponse(BaseModel):
     version: str
 
 
+# ============================================================================
+# Middleware
+# ============================================================================
+
+# Largest request body accepted after gzip decompression (50 x 50 KB batch
+# items fit comfortably; anything bigger is a decompression bomb)
+MAX_INFLATED_BODY_BYTES = 16 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """
+    Inflate request bodies sent with Content-Encoding: gzip.
+    
+    Clients compress large page_source payloads (see client.py); endpoints
+    see the plain JSON body with the encoding header removed.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        headers = dict(scope.get("headers", [])) if scope["type"] == "http" else {}
+        if headers.get(b"content-encoding", b"").strip().lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+        
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return  # client went away
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)  # gzip container
+        try:
+            body = inflater.decompress(b"".join(chunks), MAX_INFLATED_BODY_BYTES + 1)
+        except zlib.error:
+            await JSONResponse({"detail": "Invalid gzip request body"}, status_code=400)(scope, receive, send)
+            return
+        if len(body) > MAX_INFLATED_BODY_BYTES:
+            await JSONResponse({"detail": "Request body too large"}, status_code=413)(scope, receive, send)
+            return
+        if not inflater.eof:
+            await JSONResponse({"detail": "Truncated gzip request body"}, status_code=400)(scope, receive, send)
+            return
+        
+        scope = dict(scope, headers=[
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode("latin-1"))])
+        
+        delivered = False
+        
+        async def receive_inflated():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        
+        await self.app(scope, receive_inflated, send)
+
+
 # ============================================================================
 # FastAPI Application
 # ============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the gateway's pooled async HTTP connections on shutdown."""
+    yield
+    await repair_service.ai_gateway.aclose()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Locator Repair Microservice",
     description="AI-powered locator healing for web automation frameworks",
     version="1.0.0",
@@ -127,10 +225,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressed bodies both ways: gzip requests are inflated before routing,
+# larger JSON responses are gzipped for clients that accept it
+app.add_middleware(GzipRequestMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize service (singleton)
 repair_service = LocatorRepairService()
 
 
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -178,34 +282,88 @@ async def repair_locator(request: RepairRequestAPI):
         }
     """
     try:
-        # Call repair service
-        result = repair_service.repair_locator(
+        # Awaited natively: the event loop keeps serving other requests
+        # while this one waits on the provider
+        result = await repair_service.repair_locator_async(
             framework=request.framework,
             page_source=request.page_source,
             failed_locator=request.failed_locator,
             context_hint=request.context_hint
         )
         
-        # Convert to API response
-        return RepairResponseAPI(
-            success=result.success,
-            original_locator=result.original_locator,
-            repaired_locator=result.repaired_locator,
-            framework=result.framework,
-            confidence=result.confidence,
-            timestamp=result.timestamp,
-            error=result.error
-        )
+        # Validate once from the dataclass and serialize in pydantic-core;
+        # returning a Response skips FastAPI's second response_model pass
+        body = RepairResponseAPI.model_validate(result).model_dump_json()
+        return Response(content=body, media_type="application/json")
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/repair/batch", response_model=RepairBatchResponseAPI)
+async def repair_locators_batch(request: RepairBatchRequestAPI):
+    """
+    Repair several broken locators in one request.
+    
+    LLM calls for the items run concurrently and identical items share one
+    call, so a batch costs about one round trip instead of one per locator.
+    
+    Args:
+        request: RepairBatchRequestAPI with a list of repair items
+        
+    Returns:
+        RepairBatchResponseAPI with one result per item, in request order
+    """
+    try:
+        results = await repair_service.repair_locators_batch_async([
+            RepairRequest(
+                framework=item.framework,
+                page_source=item.page_source,
+                failed_locator=item.failed_locator,
+                context_hint=item.context_hint
+            )
+            for item in request.items
+        ])
+        
+        body = RepairBatchResponseAPI(
+            results=[RepairResponseAPI.model_validate(result) for result in results]
+        ).model_dump_json()
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Polling dashboards may reuse recent/stats responses this long
+LOG_QUERY_MAX_AGE = 2
+
+
+def _log_cache_headers(variant: str) -> dict:
+    """ETag / Last-Modified / Cache-Control for a query over the repair log."""
+    revision, last_logged_ns = repair_service.get_log_revision()
+    digest = hashlib.blake2b(f"{variant}|{revision}".encode("utf-8"), digest_size=8).hexdigest()
+    last_modified = datetime.fromtimestamp(last_logged_ns // 1_000_000_000, tz=timezone.utc)
+    return {
+        "ETag": f'"{digest}"',
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"max-age={LOG_QUERY_MAX_AGE}"
+    }
+
+
+def _not_modified(request: Request, headers: dict) -> bool:
+    """True if the client's If-None-Match already names the current ETag."""
+    if_none_match = request.headers.get("if-none-match", "")
+    return headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*"
+
+
 @app.get("/api/repairs/recent")
-async def get_recent_repairs(limit: int = 10):
+async def get_recent_repairs(request: Request, limit: int = 10):
     """
     Get recent repair attempts for analytics.
     
+    Answers 304 Not Modified, without reading the log, when the client's
+    If-None-Match matches the ETag of the current log revision.
+    
     Args:
         limit: Number of recent repairs to return (default: 10)
         
@@ -213,49 +371,33 @@ async def get_recent_repairs(limit: int = 10):
         List of recent repair attempts
     """
     try:
-        repairs = repair_service.get_recent_repairs(limit=limit)
-        return {"repairs": repairs, "count": len(repairs)}
+        headers = _log_cache_headers(f"recent:{limit}")
+        if _not_modified(request, headers):
+            return Response(status_code=304, headers=headers)
+        
+        repairs = await asyncio.to_thread(repair_service.get_recent_repairs, limit=limit)
+        return JSONResponse({"repairs": repairs, "count": len(repairs)}, headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/stats")
-async def get_statistics():
+async def get_statistics(request: Request):
     """
     Get repair service statistics.
     
+    Supports the same ETag / 304 revalidation as /api/repairs/recent.
+    
     Returns:
         Statistics about repairs (success rate, framework breakdown, etc.)
     """
     try:
-        repairs = repair_service.get_recent_repairs(limit=100)
-        
-        if not repairs:
-            return {
-                "total_repairs": 0,
-                "success_rate": 0,
-                "by_framework": {}
-            }
-        
-        # Calculate statistics
-        total = len(repairs)
-        successful = sum(1 for r in repairs if r.get("success", False))
-        by_framework = {}
-        
-        for repair in repairs:
-            framework = repair.get("framework", "unknown")
-            if framework not in by_framework:
-                by_framework[framework] = {"total": 0, "successful": 0}
-            by_framework[framework]["total"] += 1
-            if repair.get("success", False):
-                by_framework[framework]["successful"] += 1
-        
-        return {
-            "total_repairs": total,
-            "success_rate": (successful / total * 100) if total > 0 else 0,
-            "by_framework": by_framework
-        }
+        headers = _log_cache_headers("stats")
+        if _not_modified(request, headers):
+            return Response(status_code=304, headers=headers)
         
+        # Counters are maintained as repairs are logged - no log scan here
+        return JSONResponse(repair_service.get_statistics(), headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -272,6 +414,7 @@ if __name__ == "__main__":
     print("📝 API Documentation: http://localhost:8000/docs")
     print("📊 Health Check: http://localhost:8000/health")
     print("🔧 Repair Endpoint: POST http://localhost:8000/api/repair")
+    print("📦 Batch Endpoint: POST http://localhost:8000/api/repair/batch")
     print()
     print("=" * 80)
     
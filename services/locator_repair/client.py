@@ -24,8 +24,97 @@ Usage:
         print(f"Fixed: {result['repaired_locator']}")
 """
 
+import gzip
+import importlib.util
+import json
+import re
 import requests
-from typing import Literal, Optional, Dict, Any
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from typing import Literal, Optional, Dict, Any, List, Tuple
+from urllib3.util.retry import Retry
+
+# Optional: orjson serializes large page_source payloads in C
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+# One pooled session for every client in the process: SmartLocator callers
+# (and pytest-xdist workers' threads) reuse warm keep-alive connections
+# instead of each client opening its own 10-connection pool
+_SESSION = requests.Session()
+_SESSION.headers["Connection"] = "keep-alive"
+for _scheme in ("http://", "https://"):
+    _SESSION.mount(_scheme, HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False  # raise_for_status() reports the final status
+        )
+    ))
+
+# Request bodies at least this large are sent gzip-compressed (page HTML
+# compresses ~5x; level 1 keeps compression far cheaper than the upload)
+GZIP_MIN_BYTES = 1024
+
+
+# page_source characters uploaded per repair (the service only puts the
+# first 2000 into the prompt; the rest is headroom)
+MAX_PAGE_SOURCE_CHARS = 8192
+
+# Context kept before the failed locator's element when windowing, so the
+# element lands inside the prompt's first 2000 characters
+_WINDOW_LEAD_CHARS = 1024
+
+# Name an old locator still shares with the page: #id / .class / [@id='...']
+_LOCATOR_NAME_RE = re.compile(r"[#.]([\w-]+)|@(?:id|class|name)\s*=\s*['\"]([^'\"]+)")
+
+
+def _extract_relevant_html(page_source: str, failed_locator: str, max_chars: int = MAX_PAGE_SOURCE_CHARS) -> str:
+    """
+    Trim page_source to what the service can use before uploading it.
+    
+    If the failed locator's id/class/name still occurs in the page, a window
+    starting shortly before its first occurrence is sent; otherwise the head
+    of the document.
+    """
+    if len(page_source) <= max_chars:
+        return page_source
+    
+    match = _LOCATOR_NAME_RE.search(failed_locator)
+    if match:
+        position = page_source.find(match.group(1) or match.group(2))
+        if position >= 0:
+            start = max(0, position - _WINDOW_LEAD_CHARS)
+            return page_source[start:start + max_chars]
+    
+    return page_source[:max_chars]
+
+
+def _trimmed_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Batch items with page_source trimmed by _extract_relevant_html."""
+    return [
+        dict(item, page_source=_extract_relevant_html(item["page_source"], item.get("failed_locator", "")))
+        if "page_source" in item else item
+        for item in items
+    ]
+
+
+def _json_body(payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+    """Encode a JSON request body, gzip-compressed when large. Returns (body, headers)."""
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
 
 
 class LocatorRepairClient:
@@ -33,17 +122,53 @@ class LocatorRepairClient:
     Client for Locator Repair microservice API.
     
     This allows remote access to the repair service via HTTP.
+    
+    By default requests go through the process-wide pooled requests session
+    (HTTP/1.1). transport="httpx" gives the client its own httpx.Client,
+    which multiplexes concurrent repairs from several threads over one
+    HTTP/2 connection when the h2 package is installed; close() it when done.
     """
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        transport: Literal["requests", "httpx"] = "requests"
+    ):
         """
         Initialize client.
         
         Args:
             base_url: Base URL of the repair service API
+            transport: "requests" (shared session) or "httpx" (own pooled client)
         """
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
+        self._uses_httpx = transport == "httpx"
+        if self._uses_httpx:
+            import httpx
+            
+            self.session = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        elif transport == "requests":
+            self.session = _SESSION
+        else:
+            raise ValueError(f"Unknown transport: {transport!r} (use 'requests' or 'httpx')")
+        
+        # Last (ETag, body) per polled URL, revalidated with If-None-Match
+        self._etag_cache: Dict[Tuple[str, Tuple], Tuple[str, Any]] = {}
+    
+    def __enter__(self) -> "LocatorRepairClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the httpx connection pool (the shared requests session stays open)."""
+        if self._uses_httpx:
+            self.session.close()
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -54,7 +179,7 @@ class LocatorRepairClient:
         """
         response = self.session.get(f"{self.base_url}/health")
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
     
     def repair_locator(
         self,
@@ -77,18 +202,26 @@ class LocatorRepairClient:
         """
         payload = {
             "framework": framework,
-            "page_source": page_source,
+            "page_source": _extract_relevant_html(page_source, failed_locator),
             "failed_locator": failed_locator,
             "context_hint": context_hint
         }
         
-        response = self.session.post(
-            f"{self.base_url}/api/repair",
-            json=payload,
-            timeout=30  # 30 second timeout
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._post_json("/api/repair", payload, timeout=30)  # 30 second timeout
+    
+    def repair_locators_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Repair several broken locators in one request.
+        
+        Args:
+            items: Repair payloads - dicts with framework, page_source,
+                failed_locator and optional context_hint
+            
+        Returns:
+            One repair response per item, in the same order
+        """
+        # LLM calls overlap server-side, but the batch waits for the slowest
+        return self._post_json("/api/repair/batch", {"items": _trimmed_items(items)}, timeout=120)["results"]
     
     def get_recent_repairs(self, limit: int = 10) -> Dict[str, Any]:
         """
@@ -100,12 +233,7 @@ class LocatorRepairClient:
         Returns:
             List of recent repairs
         """
-        response = self.session.get(
-            f"{self.base_url}/api/repairs/recent",
-            params={"limit": limit}
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._get_revalidated("/api/repairs/recent", {"limit": limit})
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -114,15 +242,175 @@ class LocatorRepairClient:
         Returns:
             Statistics about repairs (success rate, framework breakdown)
         """
-        response = self.session.get(f"{self.base_url}/api/stats")
+        return self._get_revalidated("/api/stats")
+    
+    def _post_json(self, path: str, payload: Dict[str, Any], timeout: float) -> Any:
+        """POST a JSON payload (gzipped when large) and parse the JSON response."""
+        body, headers = _json_body(payload)
+        body_arg = "content" if self._uses_httpx else "data"
+        response = self.session.post(
+            f"{self.base_url}{path}", headers=headers, timeout=timeout, **{body_arg: body}
+        )
+        response.raise_for_status()
+        return _json_loads(response.content)
+    
+    def _get_revalidated(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a JSON endpoint, reusing the previous body when the server answers 304."""
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        
+        data = _json_loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[key] = (etag, data)
+        return data
+
+
+class AsyncLocatorRepairClient:
+    """
+    Async client for the Locator Repair microservice.
+    
+    For async test code (pytest-asyncio, Playwright async API): concurrent
+    repairs share one long-lived httpx.AsyncClient, multiplexed over a single
+    HTTP/2 connection when the h2 package is installed.
+    
+    Example:
+        async with AsyncLocatorRepairClient() as client:
+            results = await asyncio.gather(*[
+                client.repair_locator("playwright", html, locator)
+                for locator in failed_locators
+            ])
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:8000", client=None):
+        """
+        Initialize client.
+        
+        Args:
+            base_url: Base URL of the repair service API
+            client: Optional httpx.AsyncClient to share (not closed by aclose())
+        """
+        import httpx
+        
+        self.base_url = base_url.rstrip("/")
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    
+    async def __aenter__(self) -> "AsyncLocatorRepairClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the underlying connection pool (if this client created it)."""
+        if self._owns_client:
+            await self._client.aclose()
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """Check if service is healthy."""
+        response = await self._client.get(f"{self.base_url}/health")
+        response.raise_for_status()
+        return _json_loads(response.content)
+    
+    async def repair_locator(
+        self,
+        framework: Literal["playwright", "selenium"],
+        page_source: str,
+        failed_locator: str,
+        context_hint: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Repair a broken locator.
+        
+        Args:
+            framework: Framework type (playwright or selenium)
+            page_source: HTML content of the page
+            failed_locator: The locator that failed
+            context_hint: Optional hint about the element
+            
+        Returns:
+            Repair response with repaired locator or error
+        """
+        payload = {
+            "framework": framework,
+            "page_source": _extract_relevant_html(page_source, failed_locator),
+            "failed_locator": failed_locator,
+            "context_hint": context_hint
+        }
+        
+        body, headers = _json_body(payload)
+        response = await self._client.post(f"{self.base_url}/api/repair", content=body, headers=headers)
+        response.raise_for_status()
+        return _json_loads(response.content)
+    
+    async def repair_locators_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Repair several broken locators in one request (results in item order)."""
+        body, headers = _json_body({"items": _trimmed_items(items)})
+        response = await self._client.post(
+            f"{self.base_url}/api/repair/batch",
+            content=body,
+            headers=headers,
+            timeout=120
+        )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)["results"]
+    
+    async def get_recent_repairs(self, limit: int = 10) -> Dict[str, Any]:
+        """Get recent repair attempts."""
+        response = await self._client.get(
+            f"{self.base_url}/api/repairs/recent",
+            params={"limit": limit}
+        )
+        response.raise_for_status()
+        return _json_loads(response.content)
+    
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get repair service statistics."""
+        response = await self._client.get(f"{self.base_url}/api/stats")
+        response.raise_for_status()
+        return _json_loads(response.content)
 
 
 # ============================================================================
 # HTTP Client Adapter (for SmartLocator)
 # ============================================================================
 
+@dataclass(frozen=True, slots=True)
+class RemoteRepairResponse:
+    """Remote repair result, field-compatible with the local RepairResponse (immutable)."""
+    success: bool
+    original_locator: str
+    repaired_locator: Optional[str]
+    framework: str
+    confidence: str
+    timestamp: str
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_json(cls, result: Dict[str, Any]) -> "RemoteRepairResponse":
+        """Build from an API response dict."""
+        return cls(
+            success=result["success"],
+            original_locator=result["original_locator"],
+            repaired_locator=result.get("repaired_locator"),
+            framework=result["framework"],
+            confidence=result["confidence"],
+            timestamp=result["timestamp"],
+            error=result.get("error")
+        )
+
+
 class RemoteRepairService:
     """
     Adapter to use remote API instead of local service.
@@ -154,29 +442,28 @@ class RemoteRepairService:
             context_hint=context_hint
         )
         
-        # Create compatible response object
-        from dataclasses import dataclass
-        from typing import Optional
-        
-        @dataclass
-        class RemoteRepairResponse:
-            success: bool
-            original_locator: str
-            repaired_locator: Optional[str]
-            framework: str
-            confidence: str
-            timestamp: str
-            error: Optional[str] = None
-        
-        return RemoteRepairResponse(
-            success=result["success"],
-            original_locator=result["original_locator"],
-            repaired_locator=result.get("repaired_locator"),
-            framework=result["framework"],
-            confidence=result["confidence"],
-            timestamp=result["timestamp"],
-            error=result.get("error")
-        )
+        return RemoteRepairResponse.from_json(result)
+    
+    def repair_locators_batch(self, requests: list) -> List[RemoteRepairResponse]:
+        """
+        Repair several locators in one remote call.
+        
+        Args:
+            requests: RepairRequest objects (or dicts with the same fields)
+            
+        Returns:
+            One response per request, in request order
+        """
+        items = [
+            request if isinstance(request, dict) else {
+                "framework": request.framework,
+                "page_source": request.page_source,
+                "failed_locator": request.failed_locator,
+                "context_hint": request.context_hint
+            }
+            for request in requests
+        ]
+        return [RemoteRepairResponse.from_json(result) for result in self.client.repair_locators_batch(items)]
     
     def get_recent_repairs(self, limit: int = 10):
         """Get recent repairs from remote API."""
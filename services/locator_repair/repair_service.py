@@ -25,15 +25,82 @@ Usage:
     )
 """
 
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Literal
-from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Literal, List, Tuple
+import asyncio
+from datetime import datetime, timezone
+import hashlib
 import json
+import mmap
+import os
 from pathlib import Path
+import queue
+import re
+import sqlite3
 import sys
+import threading
+import time
+import weakref
 
 # Import AI Gateway from same service
-from .ai_gateway import AIGateway
+from .ai_gateway import AIGateway, _is_error_response
+
+# Optional: orjson encodes/parses repair log lines in C
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Optional: xxHash (XXH3) for page/screenshot content digests - a non-cryptographic
+# SIMD hash is plenty for cache keys (stdlib hashlib otherwise)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# /api/stats covers this many most recent logged repairs
+STATS_WINDOW = 100
+
+# Concurrent LLM calls per batch repair
+BATCH_MAX_WORKERS = 8
+
+# Repaired locators remembered per service (~100 B each)
+REPAIR_CACHE_MAX_ITEMS = 1024
+
+# Characters of page HTML included in a repair prompt
+PROMPT_PAGE_CHARS = 2000
+
+# Markdown code fences and JSON wrappers around an AI-suggested locator
+_FENCE_RE = re.compile(r"^```(?:[\w+-]*\n)?|```$", re.MULTILINE)
+_JSON_WRAP_RE = re.compile(r'^\{?\s*"?locator"?\s*:\s*"((?:[^"\\]|\\.)+)"\s*\}?$')
+_LOCATOR_QUOTES = "\"`'"
+
+# Write buffer of the background repair-log writer
+LOG_BUFFER_BYTES = 1 << 16
+
+# First block read from the end of the log by get_recent_repairs()
+LOG_TAIL_BLOCK_BYTES = 1 << 16
+
+# Logs at least this large are tail-read through mmap instead
+LOG_MMAP_MIN_BYTES = 1 << 20
+
+# Repair log schema when log_path ends in .db (SQLite, WAL mode)
+_REPAIRS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS repairs("
+    "ts INTEGER, framework TEXT, success INTEGER, original TEXT, "
+    "repaired TEXT, confidence TEXT, error TEXT, source TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_repairs_ts ON repairs(ts)",
+)
+_INSERT_REPAIR = "INSERT INTO repairs VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_SELECT_RECENT_REPAIRS = (
+    "SELECT ts, framework, success, original, repaired, confidence, error, source "
+    "FROM repairs ORDER BY ts DESC, rowid DESC LIMIT ?"
+)
 
 
 @dataclass
@@ -53,8 +120,125 @@ class RepairResponse:
     repaired_locator: Optional[str]
     framework: str
     confidence: str  # high, medium, low
-    timestamp: str
+    timestamp_ns: int  # time.time_ns() of the repair
     error: Optional[str] = None
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO 8601 UTC time of the repair (formatted on access)."""
+        return _format_timestamp_ns(self.timestamp_ns)
+
+
+def _format_timestamp_ns(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as an ISO 8601 UTC timestamp (microseconds)."""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=nanos // 1000).isoformat()
+
+
+# Framework-specific syntax hints (keys are the supported frameworks)
+_SYNTAX_HINTS = {
+    "playwright": "CSS selector or text=, role=, etc.",
+    "selenium": "XPath or CSS selector"
+}
+
+# Static repair-prompt pieces per framework, formatted once at import:
+# (intro up to the failed locator, framework line + page header, rules)
+_PROMPT_PARTS = {
+    framework: (
+        f"You are a web automation expert. A {framework} locator has failed.\n\nFAILED LOCATOR: ",
+        f"FRAMEWORK: {framework} (use {hint} syntax)\n\nPAGE HTML (truncated):\n",
+        f"""
+
+Analyze the HTML and suggest ONE corrected locator that will find the element.
+Return ONLY the locator string, no explanations or markdown.
+
+Rules:
+- Return locator in {framework} syntax
+- Must be a working selector
+- No code blocks, no explanations
+- Just the locator string
+""",
+    )
+    for framework, hint in _SYNTAX_HINTS.items()
+}
+
+FRAMEWORKS = frozenset(_PROMPT_PARTS)
+
+
+def _check_framework(framework: str):
+    """Fail fast on frameworks the service has no prompt for (Literal is not enforced at runtime)."""
+    if framework not in FRAMEWORKS:
+        raise ValueError(f"Unsupported framework: {framework!r} (expected one of {sorted(FRAMEWORKS)})")
+
+
+def _json_line(entry: dict) -> bytes:
+    """One repair log line (UTF-8 JSON + newline)."""
+    if orjson is not None:
+        return orjson.dumps(entry) + b"\n"
+    return (json.dumps(entry) + "\n").encode("utf-8")
+
+
+# Simple locators that can be checked against the page without the AI
+_ID_LOCATOR_RE = re.compile(r"#([\w-]+)")
+_CLASS_LOCATOR_RE = re.compile(r"\.([\w-]+)")
+
+
+@lru_cache(maxsize=256)
+def _attribute_pattern(attribute: str, name: str) -> "re.Pattern[str]":
+    """Regex for an id="name" / class="... name ..." attribute in HTML."""
+    if attribute == "id":
+        value = rf"""(["']?){re.escape(name)}\1(?=[\s/>])"""
+    else:
+        value = rf"""(["'])[^"'<>]{{0,1000}}?(?<![\w-]){re.escape(name)}(?![\w-])[^"'<>]{{0,1000}}\1"""
+    return re.compile(rf"(?<![\w-])(?i:{attribute})\s*=\s*{value}")
+
+
+def _likely_still_valid(failed_locator: str, page_source: str) -> bool:
+    """
+    True if a plain #id / .class locator still matches an element in the page.
+    
+    Such failures are usually timing issues (element not rendered yet), so the
+    original locator is returned without asking the AI.
+    """
+    locator = failed_locator.strip()
+    match = _ID_LOCATOR_RE.fullmatch(locator)
+    if match:
+        return _attribute_pattern("id", match.group(1)).search(page_source) is not None
+    match = _CLASS_LOCATOR_RE.fullmatch(locator)
+    if match:
+        return _attribute_pattern("class", match.group(1)).search(page_source) is not None
+    return False
+
+
+# Queued after the last log entry to stop the writer thread
+_LOG_STOP = object()
+
+
+def _stop_log_writer(log_queue: "queue.Queue[dict]", log_thread: threading.Thread):
+    """Let the writer thread drain the queue, then wait for it to exit."""
+    log_queue.put(_LOG_STOP)
+    log_thread.join()
+
+
+def _close_quietly(*handles):
+    """Close open log handles, ignoring errors."""
+    for handle in handles:
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+
+def _tail_of_buffer(buffer, size: int, limit: int) -> List[bytes]:
+    """Last `limit` lines of a bytes-like buffer, found by scanning back for newlines."""
+    stop = size - 1 if buffer[size - 1:size] == b"\n" else size  # ignore the final newline
+    start = stop
+    for _ in range(limit):
+        start = buffer.rfind(b"\n", 0, start)
+        if start < 0:
+            break
+    return buffer[start + 1 if start >= 0 else 0:stop].split(b"\n")
 
 
 class LocatorRepairService:
@@ -66,10 +250,57 @@ class LocatorRepairService:
     """
     
     def __init__(self, log_path: Optional[Path] = None):
-        """Initialize the repair service."""
+        """
+        Initialize the repair service.
+        
+        Args:
+            log_path: Repair log (default: $REPAIR_LOG_PATH or
+                logs/healing_log.json). JSON lines, or a SQLite database
+                with indexed recent-repair queries when it ends in .db
+        """
         self.ai_gateway = AIGateway()
-        self.log_path = log_path or Path(__file__).parents[2] / "logs" / "healing_log.json"
+        self.log_path = Path(
+            log_path or os.getenv("REPAIR_LOG_PATH") or Path(__file__).parents[2] / "logs" / "healing_log.json"
+        )
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log_is_db = self.log_path.suffix == ".db"
+        if self._log_is_db:
+            self._connect_log_db(self.log_path).close()  # create schema / WAL up front
+        
+        # Identical requests (same page, locator and hint) reuse the last repair
+        self._repair_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._repair_cache_lock = threading.Lock()
+        
+        # Repairs currently waiting on the AI, by _repair_key
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Repair log lines are appended by one writer thread that keeps the
+        # file open, so repairs never wait on disk I/O. The thread holds no
+        # reference to the service; it is drained and stopped by close(),
+        # when the service is garbage-collected, or at exit
+        self._log_queue: "queue.Queue[dict]" = queue.Queue()
+        log_thread = threading.Thread(
+            target=self._log_worker,
+            args=(self._log_queue, self.log_path, self._log_is_db),
+            name="repair-log-writer",
+            daemon=True
+        )
+        log_thread.start()
+        self._log_closer = weakref.finalize(self, _stop_log_writer, self._log_queue, log_thread)
+        
+        # Running counters over the last STATS_WINDOW logged repairs, updated
+        # as repairs are logged so get_statistics() never rescans the log
+        self._stats_lock = threading.Lock()
+        self._stats_window = deque(maxlen=STATS_WINDOW)
+        self._stats = {"total": 0, "successful": 0, "by_framework": {}}
+        for entry in self.get_recent_repairs(limit=STATS_WINDOW):
+            self._record_stats(entry)
+        
+        # Bumped per logged repair; lets the API answer polls with 304s
+        self._log_revision = 0
+        self._log_generation = time.time_ns()  # distinguishes service restarts
+        self._last_logged_ns = self._log_generation
         
     def repair_locator(
         self,
@@ -91,45 +322,313 @@ class LocatorRepairService:
             RepairResponse with repaired locator or error
         """
         try:
-            # Build framework-agnostic prompt
-            prompt = self._build_repair_prompt(
-                framework=framework,
-                page_source=page_source,
-                failed_locator=failed_locator,
-                context_hint=context_hint
-            )
+            _check_framework(framework)
             
-            # Call AI (single source of truth)
-            ai_response = self.ai_gateway.ask(prompt)
+            # Original locator still matches the page: a timing issue, not a break
+            if _likely_still_valid(failed_locator, page_source):
+                return self._repaired(framework, failed_locator, failed_locator, source="noop")
             
-            # Clean and validate response
-            repaired_locator = self._clean_locator(ai_response)
+            # Same request seen recently: skip prompt build and AI call
+            cache_key = self._repair_key(framework, self._page_digest(page_source), failed_locator, context_hint)
+            cached = self._repair_cache_get(cache_key)
+            if cached is not None:
+                return self._repaired(framework, failed_locator, cached, source="cache")
             
-            # Build response
-            response = RepairResponse(
-                success=True,
-                original_locator=failed_locator,
-                repaired_locator=repaired_locator,
-                framework=framework,
-                confidence="high",  # Can be enhanced with confidence scoring
-                timestamp=datetime.now().isoformat()
-            )
+            # Same request already being repaired on another thread: share its answer
+            inflight, owner = self._claim_inflight(cache_key)
+            if not owner:
+                return self._repaired(framework, failed_locator, inflight.result(), source="shared")
             
-            # Log the repair
-            self._log_repair(response)
+            try:
+                # Build framework-agnostic prompt
+                prompt = self._build_repair_prompt(
+                    framework=framework,
+                    page_source=page_source,
+                    failed_locator=failed_locator,
+                    context_hint=context_hint
+                )
+                
+                # Call AI (single source of truth)
+                ai_response = self.ai_gateway.ask(prompt)
+                
+                response = self._repaired(framework, failed_locator, ai_response, cache_key=cache_key)
+                inflight.set_result(ai_response)
+                return response
+            except BaseException as e:
+                self._fail_inflight(inflight, e)
+                raise
+            finally:
+                self._release_inflight(cache_key)
             
-            return response
+        except Exception as e:
+            return self._failed(framework, failed_locator, e)
+    
+    async def repair_locator_async(
+        self,
+        framework: Literal["playwright", "selenium"],
+        page_source: str,
+        failed_locator: str,
+        context_hint: str = ""
+    ) -> RepairResponse:
+        """
+        Async variant of repair_locator (used by the REST API).
+        
+        The LLM call is awaited on the gateway's async client, so concurrent
+        repairs share one event loop instead of one thread each.
+        """
+        try:
+            _check_framework(framework)
+            if _likely_still_valid(failed_locator, page_source):
+                return self._repaired(framework, failed_locator, failed_locator, source="noop")
+            
+            cache_key = self._repair_key(framework, self._page_digest(page_source), failed_locator, context_hint)
+            cached = self._repair_cache_get(cache_key)
+            if cached is not None:
+                return self._repaired(framework, failed_locator, cached, source="cache")
+            
+            inflight, owner = self._claim_inflight(cache_key)
+            if not owner:
+                ai_response = await asyncio.wrap_future(inflight)
+                return self._repaired(framework, failed_locator, ai_response, source="shared")
+            
+            try:
+                prompt = self._build_repair_prompt(
+                    framework=framework,
+                    page_source=page_source,
+                    failed_locator=failed_locator,
+                    context_hint=context_hint
+                )
+                
+                ai_response = await self.ai_gateway.ask_async(prompt)
+                
+                response = self._repaired(framework, failed_locator, ai_response, cache_key=cache_key)
+                inflight.set_result(ai_response)
+                return response
+            except BaseException as e:
+                self._fail_inflight(inflight, e)
+                raise
+            finally:
+                self._release_inflight(cache_key)
             
         except Exception as e:
-            return RepairResponse(
-                success=False,
-                original_locator=failed_locator,
-                repaired_locator=None,
-                framework=framework,
-                confidence="low",
-                timestamp=datetime.now().isoformat(),
-                error=str(e)
+            return self._failed(framework, failed_locator, e)
+    
+    def repair_locators_batch(self, requests: List[RepairRequest]) -> List[RepairResponse]:
+        """
+        Repair several locators with overlapping LLM calls.
+        
+        Cached items are answered directly, identical prompts (same framework,
+        page, locator and hint) share one AI call and the rest run
+        concurrently, so a batch costs roughly one LLM round trip instead of
+        one per locator.
+        
+        Args:
+            requests: Locators to repair
+            
+        Returns:
+            One RepairResponse per request, in request order
+        """
+        pages: Dict[int, Tuple[bytes, str]] = {}
+        plans = [self._plan_batch_item(request, pages) for request in requests]
+        unique = list(dict.fromkeys(prompt for _, _, prompt in plans if isinstance(prompt, str)))
+        
+        answers = {}
+        if unique:
+            with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(unique))) as executor:
+                futures = {prompt: executor.submit(self.ai_gateway.ask, prompt) for prompt in unique}
+                for prompt, future in futures.items():
+                    try:
+                        answers[prompt] = future.result()
+                    except Exception as e:
+                        answers[prompt] = e
+        
+        return [self._batch_response(request, plan, answers) for request, plan in zip(requests, plans)]
+    
+    async def repair_locators_batch_async(self, requests: List[RepairRequest]) -> List[RepairResponse]:
+        """Async variant of repair_locators_batch (used by the REST API)."""
+        pages: Dict[int, Tuple[bytes, str]] = {}
+        plans = [self._plan_batch_item(request, pages) for request in requests]
+        unique = list(dict.fromkeys(prompt for _, _, prompt in plans if isinstance(prompt, str)))
+        
+        results = await asyncio.gather(
+            *(self.ai_gateway.ask_async(prompt) for prompt in unique),
+            return_exceptions=True
+        )
+        answers = dict(zip(unique, results))
+        
+        return [self._batch_response(request, plan, answers) for request, plan in zip(requests, plans)]
+    
+    def _plan_batch_item(self, request: RepairRequest, pages: Dict[int, Tuple[bytes, str]]) -> tuple:
+        """
+        (cache key, known answer, prompt) for one batch item.
+        
+        The known answer is (locator, source) when no AI call is needed, and
+        the prompt is then None; a failed prompt build yields the exception.
+        
+        `pages` memoises (digest, prompt excerpt) per page object for the
+        batch, so items sharing a page hash and slice it once. Keying by id()
+        is safe here: the batch's requests keep every page alive meanwhile.
+        """
+        try:
+            _check_framework(request.framework)
+            if _likely_still_valid(request.failed_locator, request.page_source):
+                return None, (request.failed_locator, "noop"), None
+            
+            page = pages.get(id(request.page_source))
+            if page is None:
+                page = pages[id(request.page_source)] = (
+                    self._page_digest(request.page_source),
+                    request.page_source[:PROMPT_PAGE_CHARS]
+                )
+            page_digest, page_excerpt = page
+            
+            cache_key = self._repair_key(
+                request.framework, page_digest, request.failed_locator, request.context_hint
             )
+            cached = self._repair_cache_get(cache_key)
+            if cached is not None:
+                return cache_key, (cached, "cache"), None
+            prompt = self._build_repair_prompt(
+                framework=request.framework,
+                page_source=page_excerpt,  # already truncated: slicing it again is free
+                failed_locator=request.failed_locator,
+                context_hint=request.context_hint
+            )
+            return cache_key, None, prompt
+        except Exception as e:
+            return None, None, e
+    
+    def _batch_response(self, request: RepairRequest, plan: tuple, answers: dict) -> RepairResponse:
+        """Turn one batch item's plan and AI answer (or exception) into a RepairResponse."""
+        cache_key, known, prompt = plan
+        try:
+            if known is not None:
+                locator, source = known
+                return self._repaired(request.framework, request.failed_locator, locator, source=source)
+            answer = prompt if isinstance(prompt, Exception) else answers[prompt]
+            if isinstance(answer, Exception):
+                return self._failed(request.framework, request.failed_locator, answer)
+            return self._repaired(request.framework, request.failed_locator, answer, cache_key=cache_key)
+        except Exception as e:
+            return self._failed(request.framework, request.failed_locator, e)
+    
+    # ------------------------------------------------------------------------
+    # Repair cache: request content hash -> cleaned locator (LRU)
+    # ------------------------------------------------------------------------
+    
+    @staticmethod
+    def _page_digest(page_source: str) -> bytes:
+        """Content hash of a page (the expensive, page-sized part of a repair key)."""
+        data = page_source.encode("utf-8")
+        if xxhash is not None:
+            return xxhash.xxh3_128_digest(data)
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    @staticmethod
+    def _repair_key(framework: str, page_digest: bytes, failed_locator: str, context_hint: str) -> str:
+        """Stable hash of a repair request (a changed page gets a new key)."""
+        h = hashlib.blake2b(f"{framework}|{failed_locator}|{context_hint}|".encode("utf-8"), digest_size=16)
+        h.update(page_digest)
+        return h.hexdigest()
+    
+    def _repair_cache_get(self, key: str) -> Optional[str]:
+        with self._repair_cache_lock:
+            locator = self._repair_cache.get(key)
+            if locator is not None:
+                self._repair_cache.move_to_end(key)
+            return locator
+    
+    def _repair_cache_put(self, key: str, locator: str):
+        with self._repair_cache_lock:
+            self._repair_cache[key] = locator
+            self._repair_cache.move_to_end(key)
+            while len(self._repair_cache) > REPAIR_CACHE_MAX_ITEMS:
+                self._repair_cache.popitem(last=False)
+    
+    # ------------------------------------------------------------------------
+    # In-flight repairs: concurrent identical requests share one AI call
+    # ------------------------------------------------------------------------
+    
+    def _claim_inflight(self, key: str) -> Tuple[Future, bool]:
+        """
+        Future for the in-flight repair of `key` and whether the caller owns it.
+        
+        The owner calls the AI and settles the future with the raw answer;
+        everyone else waits on it instead of making the same call.
+        """
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                return inflight, False
+            inflight = self._inflight[key] = Future()
+            return inflight, True
+    
+    def _release_inflight(self, key: str):
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+    
+    @staticmethod
+    def _fail_inflight(inflight: Future, error: BaseException):
+        """Pass the owner's failure on to waiting duplicates (unless already answered)."""
+        if inflight.done():
+            return
+        if not isinstance(error, Exception):  # cancelled / interrupted owner
+            error = RuntimeError(f"Repair interrupted: {error!r}")
+        inflight.set_exception(error)
+    
+    def _repaired(
+        self,
+        framework: str,
+        failed_locator: str,
+        ai_response: str,
+        cache_key: Optional[str] = None,
+        source: str = "ai"
+    ) -> RepairResponse:
+        """
+        Build a successful response, log it and cache the locator.
+        
+        Args:
+            ai_response: Raw AI answer (or the already clean locator when
+                source is "cache" or "noop")
+            cache_key: _repair_key of the request, to cache a fresh answer
+            source: "ai", "cache", "shared" (answer of a concurrent identical
+                request) or "noop" (original locator still matches the page);
+                recorded in the repair log
+        """
+        if source in ("cache", "noop"):
+            repaired_locator = ai_response
+        else:
+            # Clean and validate response
+            repaired_locator = self._clean_locator(ai_response)
+            if cache_key and repaired_locator and not _is_error_response(ai_response.strip()):
+                self._repair_cache_put(cache_key, repaired_locator)
+        
+        # Build response
+        response = RepairResponse(
+            success=True,
+            original_locator=failed_locator,
+            repaired_locator=repaired_locator,
+            framework=framework,
+            confidence="high",  # Can be enhanced with confidence scoring
+            timestamp_ns=time.time_ns()
+        )
+        
+        # Log the repair
+        self._log_repair(response, source=source)
+        
+        return response
+    
+    def _failed(self, framework: str, failed_locator: str, error: Exception) -> RepairResponse:
+        """Build the failure response for an exception during repair."""
+        return RepairResponse(
+            success=False,
+            original_locator=failed_locator,
+            repaired_locator=None,
+            framework=framework,
+            confidence="low",
+            timestamp_ns=time.time_ns(),
+            error=str(error)
+        )
     
     def _build_repair_prompt(
         self,
@@ -139,89 +638,267 @@ class LocatorRepairService:
         context_hint: str
     ) -> str:
         """Build AI prompt for locator repair."""
-        # Framework-specific syntax hints
-        syntax_hints = {
-            "playwright": "CSS selector or text=, role=, etc.",
-            "selenium": "XPath or CSS selector"
-        }
-        
-        prompt = f"""You are a web automation expert. A {framework} locator has failed.
-
-FAILED LOCATOR: {failed_locator}
-CONTEXT: {context_hint or "Not provided"}
-FRAMEWORK: {framework} (use {syntax_hints.get(framework, 'standard')} syntax)
-
-PAGE HTML (truncated):
-{page_source[:2000]}
-
-Analyze the HTML and suggest ONE corrected locator that will find the element.
-Return ONLY the locator string, no explanations or markdown.
-
-Rules:
-- Return locator in {framework} syntax
-- Must be a working selector
-- No code blocks, no explanations
-- Just the locator string
-"""
+        intro, page_header, rules = _PROMPT_PARTS[framework]
+        prompt = "".join((
+            intro, failed_locator,
+            "\nCONTEXT: ", context_hint or "Not provided", "\n",
+            page_header, page_source[:PROMPT_PAGE_CHARS],
+            rules
+        ))
         return prompt
     
     def _clean_locator(self, ai_response: str) -> str:
         """Clean AI response to extract pure locator."""
-        locator = ai_response.strip()
-        
-        # Remove markdown code blocks
-        if locator.startswith("```"):
-            locator = locator.split("\n", 1)[1] if "\n" in locator else locator
-        if locator.endswith("```"):
-            locator = locator.rsplit("\n", 1)[0] if "\n" in locator else locator
-            
-        # Remove quotes
-        locator = locator.strip('"`\'')
+        # Remove markdown code fences (```lang lines and closing ```)
+        locator = _FENCE_RE.sub("", ai_response.strip()).strip()
         
-        # Take first line only
-        locator = locator.split("\n")[0].strip()
+        # Unwrap {"locator": "..."} answers
+        wrapped = _JSON_WRAP_RE.match(locator)
+        if wrapped:
+            try:
+                return json.loads(f'"{wrapped.group(1)}"').strip()
+            except ValueError:
+                return wrapped.group(1).strip()
         
-        return locator
+        # Take first line only, without surrounding quotes
+        return locator.split("\n", 1)[0].strip().strip(_LOCATOR_QUOTES).strip()
     
-    def _log_repair(self, response: RepairResponse):
+    def _log_repair(self, response: RepairResponse, source: str = "ai"):
         """Log repair attempt to JSON file."""
+        # "timestamp" stays in ns until the writer thread formats it
         log_entry = {
-            "timestamp": response.timestamp,
+            "timestamp": response.timestamp_ns,
             "framework": response.framework,
             "success": response.success,
             "original_locator": response.original_locator,
             "repaired_locator": response.repaired_locator,
             "confidence": response.confidence,
-            "error": response.error
+            "error": response.error,
+            "source": source
         }
         
+        if self._log_closer.alive:
+            self._log_queue.put_nowait(log_entry)
+        
+        with self._stats_lock:
+            self._record_stats(log_entry)
+            self._log_revision += 1
+            self._last_logged_ns = max(self._last_logged_ns, response.timestamp_ns)
+    
+    def get_log_revision(self) -> Tuple[str, int]:
+        """
+        Revision of the repair log, for HTTP caching of recent/stats queries.
+        
+        Returns:
+            (tag that changes whenever a repair is logged,
+             time_ns of the last logged repair or service start)
+        """
+        with self._stats_lock:
+            return f"{self._log_generation:x}-{self._log_revision}", self._last_logged_ns
+    
+    @staticmethod
+    def _log_worker(log_queue: "queue.Queue[dict]", log_path: Path, log_is_db: bool):
+        """Append queued log entries to the log file or database (runs on the writer thread)."""
+        log_file = None
+        log_db = None
+        stopping = False
+        while not stopping:
+            # Everything queued so far goes out in one write + flush
+            entries = [log_queue.get()]
+            try:
+                while True:
+                    entries.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            records = [entry for entry in entries if entry is not _LOG_STOP]
+            stopping = len(records) < len(entries)
+            
+            try:
+                if not records:
+                    pass
+                elif log_is_db:
+                    if log_db is None:
+                        log_db = LocatorRepairService._connect_log_db(log_path)
+                    LocatorRepairService._insert_repairs(log_db, records)
+                else:
+                    for entry in records:
+                        entry["timestamp"] = _format_timestamp_ns(entry["timestamp"])
+                    if log_file is None:
+                        log_file = open(log_path, "ab", buffering=LOG_BUFFER_BYTES)
+                    log_file.write(b"".join(_json_line(entry) for entry in records))
+                    log_file.flush()
+            except Exception as e:
+                print(f"Warning: Could not log repair: {e}")
+                _close_quietly(log_file, log_db)
+                log_file = log_db = None
+            finally:
+                for _ in entries:
+                    log_queue.task_done()
+        _close_quietly(log_file, log_db)
+    
+    @staticmethod
+    def _connect_log_db(log_path: Path) -> sqlite3.Connection:
+        """Open the SQLite repair log (autocommit, WAL: readers never block the writer)."""
+        db = sqlite3.connect(log_path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _REPAIRS_SCHEMA:
+            db.execute(statement)
+        return db
+    
+    @staticmethod
+    def _insert_repairs(db: sqlite3.Connection, entries: List[dict]):
+        """Insert queued log entries in one transaction."""
+        rows = [
+            (
+                entry["timestamp"], entry["framework"], int(entry["success"]),
+                entry["original_locator"], entry["repaired_locator"],
+                entry["confidence"], entry["error"], entry["source"]
+            )
+            for entry in entries
+        ]
+        db.execute("BEGIN")
         try:
-            # Append to log file
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry) + "\n")
-        except Exception as e:
-            print(f"Warning: Could not log repair: {e}")
+            db.executemany(_INSERT_REPAIR, rows)
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+    
+    def flush_log(self):
+        """Block until every logged repair has been written to the log file."""
+        self._log_queue.join()
+    
+    def close(self):
+        """
+        Write out pending log entries and stop the log writer thread.
+        
+        Safe to call more than once; repairs made after close() are not logged.
+        """
+        self._log_closer()
+    
+    def __enter__(self) -> "LocatorRepairService":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _record_stats(self, entry: dict):
+        """Slide the stats window forward by one logged repair (caller holds the lock)."""
+        if len(self._stats_window) == self._stats_window.maxlen:
+            self._count_repair(self._stats_window[0], -1)
+        self._stats_window.append(entry)
+        self._count_repair(entry, 1)
+    
+    def _count_repair(self, entry: dict, delta: int):
+        """Add (delta=1) or remove (delta=-1) one repair from the counters."""
+        success = int(bool(entry.get("success", False))) * delta
+        framework = entry.get("framework", "unknown")
+        by_framework = self._stats["by_framework"]
+        counts = by_framework.setdefault(framework, {"total": 0, "successful": 0})
+        
+        self._stats["total"] += delta
+        self._stats["successful"] += success
+        counts["total"] += delta
+        counts["successful"] += success
+        if counts["total"] == 0:
+            del by_framework[framework]
+    
+    def get_statistics(self) -> dict:
+        """
+        Statistics over the last STATS_WINDOW logged repairs (O(1), no log read).
+        
+        Returns:
+            dict: total_repairs, success_rate (percent) and by_framework counts
+        """
+        with self._stats_lock:
+            total = self._stats["total"]
+            successful = self._stats["successful"]
+            by_framework = {name: dict(counts) for name, counts in self._stats["by_framework"].items()}
+        
+        return {
+            "total_repairs": total,
+            "success_rate": (successful / total * 100) if total > 0 else 0,
+            "by_framework": by_framework
+        }
     
     def get_recent_repairs(self, limit: int = 10) -> list[dict]:
         """Get recent repair attempts."""
+        self.flush_log()
         if not self.log_path.exists():
             return []
         
         try:
-            with open(self.log_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            if self._log_is_db:
+                return self._recent_repairs_from_db(limit)
+            
+            lines = self._tail_lines(limit)
             
             # Parse last N lines
             repairs = []
-            for line in lines[-limit:]:
+            for line in lines:
                 try:
-                    repairs.append(json.loads(line.strip()))
+                    repairs.append(_json_loads(line.strip()))
                 except:
                     continue
             
             return repairs
         except Exception:
             return []
+    
+    def _recent_repairs_from_db(self, limit: int) -> list[dict]:
+        """Last `limit` repairs from the SQLite log (idx_repairs_ts), oldest first."""
+        db = sqlite3.connect(self.log_path)
+        try:
+            rows = db.execute(_SELECT_RECENT_REPAIRS, (limit,)).fetchall()
+        finally:
+            db.close()
+        
+        return [
+            {
+                "timestamp": _format_timestamp_ns(ts),
+                "framework": framework,
+                "success": bool(success),
+                "original_locator": original,
+                "repaired_locator": repaired,
+                "confidence": confidence,
+                "error": error,
+                "source": source
+            }
+            for ts, framework, success, original, repaired, confidence, error, source in reversed(rows)
+        ]
+    
+    def _tail_lines(self, limit: int) -> List[bytes]:
+        """
+        Last `limit` lines of the log, read backwards from the end of the file.
+        
+        Large logs are memory-mapped and scanned back for newlines, so only the
+        tail pages are touched and copied. Otherwise (or if the file cannot be
+        mapped) reading starts with a LOG_TAIL_BLOCK_BYTES block and doubles it
+        until it holds enough complete lines. Either way the cost tracks
+        `limit`, not the log size.
+        """
+        with open(self.log_path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size >= LOG_MMAP_MIN_BYTES and limit > 0:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        return _tail_of_buffer(mapped, size, limit)
+                except (OSError, ValueError):
+                    pass  # not mappable (e.g. some network filesystems)
+            
+            block = LOG_TAIL_BLOCK_BYTES
+            while True:
+                start = max(0, size - block) if limit > 0 else 0
+                f.seek(start)
+                lines = f.read(size - start).split(b"\n")
+                if lines and not lines[-1]:
+                    lines.pop()  # text after the final newline
+                if start > 0:
+                    lines.pop(0)  # partial line cut by the block boundary
+                if start == 0 or len(lines) >= limit:
+                    return lines[-limit:]
+                block *= 2
 
 
 # Convenience function for quick usage
@@ -245,10 +922,10 @@ def repair_locator(
         if result.success:
             element = page.locator(result.repaired_locator)
     """
-    service = LocatorRepairService()
-    return service.repair_locator(
-        framework=framework,
-        page_source=page_source,
-        failed_locator=failed_locator,
-        context_hint=context_hint
-    )
+    with LocatorRepairService() as service:
+        return service.repair_locator(
+            framework=framework,
+            page_source=page_source,
+            failed_locator=failed_locator,
+            context_hint=context_hint
+        )
@@ -0,0 +1,94 @@
+"""
+tests/conftest.py
+---------------------------------------------------
+Shared browser fixtures.
+
+Chromium is launched once per test session; each test
+gets its own BrowserContext (cookies, storage, cache),
+which is cheap to create and is closed after the test.
+---------------------------------------------------
+"""
+
+import pytest
+
+
+# ========================================
+# PLAYWRIGHT
+# ========================================
+
+@pytest.fixture(scope="session")
+def _pw():
+    """Playwright driver process for the whole session.
+
+    Only one sync Playwright can run per thread, so tests take browsers
+    from here instead of opening sync_playwright() themselves.
+    """
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser(_pw):
+    """Headless Chromium shared by all Playwright tests."""
+    browser = _pw.chromium.launch(
+        headless=True,
+        args=['--ignore-certificate-errors']  # SSL bypass for corporate networks
+    )
+    yield browser
+    browser.close()
+
+
+@pytest.fixture
+def page(browser):
+    """Playwright page in a fresh context (closed after each test)."""
+    context = browser.new_context(ignore_https_errors=True)
+    page = context.new_page()
+    yield page
+    context.close()
+
+
+# ========================================
+# SELENIUM
+# ========================================
+
+@pytest.fixture(scope="session")
+def chromedriver_path():
+    """Chromedriver resolved once per session (the version check hits the network)."""
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+@pytest.fixture(scope="session")
+def _chrome(chromedriver_path):
+    """Headless Chrome shared by all Selenium tests (reset between tests by `driver`)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--ignore-certificate-errors")  # SSL bypass for corporate networks
+
+    driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})  # once per session
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture
+def driver(_chrome):
+    """Selenium WebDriver, isolated per test: cookies and the last page's
+    storage are cleared and the tab is parked on about:blank afterwards."""
+    yield _chrome
+
+    _chrome.delete_all_cookies()
+    origin = _chrome.execute_script("return window.location.origin")
+    if origin and origin != "null":  # data:/about: pages have no storage
+        _chrome.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    _chrome.get("about:blank")
@@ -15,6 +15,7 @@ import pytest
 import json
 import os
 import time
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import sys
 
@@ -35,7 +36,8 @@ def temp_healer(tmp_path):
     cache_path = tmp_path / "healing_cache.json"
     
     healer = AIHealer(log_path=str(log_path), cache_path=str(cache_path))
-    return healer
+    yield healer
+    healer.close()
 
 
 @pytest.fixture
@@ -70,18 +72,21 @@ def test_cache_hit_no_api_call(temp_healer, mock_page):
         assert mock_ai.call_count == 1
         assert result1 == 'button[type="submit"]'
         
-        # Second call - should use cache
-        result2 = temp_healer.heal_locator(mock_page, failed_locator, context, engine)
+        # Second call - should use cache without rewriting the cache file
+        with patch.object(temp_healer, '_save_cache') as save:
+            result2 = temp_healer.heal_locator(mock_page, failed_locator, context, engine)
         assert mock_ai.call_count == 1  # Still 1, not called again
+        save.assert_not_called()
         assert result2 == 'button[type="submit"]'
     
     # Verify cache contains the entry
-    cache_key = f"{engine}:{failed_locator}:{context}"
+    cache_key = (engine, failed_locator, context)
     assert cache_key in temp_healer.cache
     
     # Verify log shows cache hit
+    temp_healer.flush()  # log lines are buffered
     with open(temp_healer.log_path, 'r') as f:
-        logs = json.load(f)
+        logs = [json.loads(line) for line in f if line.strip()]
     
     assert len(logs) == 2
     assert logs[0]['healing_source'] == 'ai'
@@ -90,6 +95,17 @@ def test_cache_hit_no_api_call(temp_healer, mock_page):
     print("✅ Test passed: Cache hit avoids redundant AI call")
 
 
+def test_same_page_shared_across_frameworks(temp_healer, mock_page):
+    """Healing the same page for Selenium after Playwright reuses the AI answer."""
+    with patch.object(temp_healer.ai, 'ask', return_value='#submit') as mock_ai:
+        pw = temp_healer.heal_locator(mock_page, "#old-button", "Submit button", "Playwright")
+        sel = temp_healer.heal_locator(mock_page, "#old-button", "Submit button", "Selenium")
+    
+    assert pw == sel == '#submit'
+    assert mock_ai.call_count == 1
+    assert ("Selenium", "#old-button", "Submit button") in temp_healer.cache
+
+
 # ========================================
 # TEST 2: CACHE MISS (API CALLED)
 # ========================================
@@ -114,7 +130,7 @@ def test_cache_miss_calls_api(temp_healer, mock_page):
         assert result == '#new-locator'
     
     # Verify it was cached
-    cache_key = f"{engine}:{failed_locator}:{context}"
+    cache_key = (engine, failed_locator, context)
     assert cache_key in temp_healer.cache
     assert temp_healer.cache[cache_key] == '#new-locator'
     
@@ -286,8 +302,9 @@ def test_fallback_used_when_ai_fails(temp_healer, mock_page):
         assert result == "button[type='submit']"  # Fallback for 'Submit'
     
     # Verify log shows fallback
+    temp_healer.flush()  # log lines are buffered
     with open(temp_healer.log_path, 'r') as f:
-        logs = json.load(f)
+        logs = [json.loads(line) for line in f if line.strip()]
     
     assert logs[-1]['healing_source'] == 'fallback'
     
@@ -315,8 +332,9 @@ def test_log_structure_contains_all_fields(temp_healer, mock_page):
     with patch.object(temp_healer.ai, 'ask', return_value='#healed'):
         temp_healer.heal_locator(mock_page, "#old", "Test context", "Playwright")
     
+    temp_healer.flush()  # log lines are buffered
     with open(temp_healer.log_path, 'r') as f:
-        logs = json.load(f)
+        logs = [json.loads(line) for line in f if line.strip()]
     
     entry = logs[-1]
     
@@ -350,16 +368,18 @@ def test_log_latency_tracking(temp_healer, mock_page):
         # First call - AI (slower)
         temp_healer.heal_locator(mock_page, "#old", "Test", "Playwright")
     
+    temp_healer.flush()  # log lines are buffered
     with open(temp_healer.log_path, 'r') as f:
-        logs = json.load(f)
+        logs = [json.loads(line) for line in f if line.strip()]
     
     ai_latency = logs[-1]['latency_ms']
     
     # Second call - Cache (faster)
     temp_healer.heal_locator(mock_page, "#old", "Test", "Playwright")
     
+    temp_healer.flush()  # log lines are buffered
     with open(temp_healer.log_path, 'r') as f:
-        logs = json.load(f)
+        logs = [json.loads(line) for line in f if line.strip()]
     
     cache_latency = logs[-1]['latency_ms']
     
@@ -389,6 +409,9 @@ def test_cache_save_load(temp_healer, mock_page):
     with patch.object(temp_healer.ai, 'ask', return_value='#healed'):
         temp_healer.heal_locator(mock_page, "#old", "Test", "Playwright")
     
+    # Cache writes are batched - flush pending entries first
+    temp_healer.flush()
+    
     # Create new instance with same cache path
     new_healer = AIHealer(
         log_path=temp_healer.log_path,
@@ -396,13 +419,97 @@ def test_cache_save_load(temp_healer, mock_page):
     )
     
     # Verify cache was loaded
-    cache_key = f"Playwright:#old:Test"
+    cache_key = ("Playwright", "#old", "Test")
     assert cache_key in new_healer.cache
     assert new_healer.cache[cache_key] == '#healed'
     
     print("✅ Test passed: Cache persists across instances")
 
 
+def test_legacy_cache_keys_load(temp_healer):
+    """Older caches keyed by "framework:locator:hint" strings still load."""
+    with open(temp_healer.cache_path, 'w') as f:
+        json.dump({"Playwright:button:has-text('Login'):Login button": "#login"}, f)
+    
+    healer = AIHealer(log_path=temp_healer.log_path, cache_path=temp_healer.cache_path)
+    assert healer.cache == {("Playwright", "button:has-text('Login')", "Login button"): "#login"}
+
+
+def test_cache_flush_is_batched(temp_healer, mock_page):
+    """
+    Test that healings mark the cache dirty instead of rewriting the file each time.
+    
+    Expected:
+        - Heals within the flush interval do not touch the cache file
+        - flush() writes all pending entries at once
+    """
+    with patch.object(temp_healer, '_save_cache', wraps=temp_healer._save_cache) as save:
+        with patch.object(temp_healer.ai, 'ask', side_effect=['#one', '#two', '#three']):
+            for locator in ("#a", "#b", "#c"):
+                temp_healer.heal_locator(mock_page, locator, "Test", "Playwright")
+        
+        assert save.call_count == 0
+        
+        temp_healer.flush()
+        temp_healer.flush()  # nothing pending - no second write
+        assert save.call_count == 1
+    
+    with open(temp_healer.cache_path, 'r') as f:
+        assert len(json.load(f)) == 3
+    
+    print("✅ Test passed: Cache flushes are batched")
+
+
+def test_close_flushes_and_drops_exit_hook(tmp_path, mock_page):
+    """
+    Test that closing a healer (or leaving its with-block) releases it.
+    
+    Expected:
+        - Pending cache entry and log line are on disk
+        - Log file handle is closed and the atexit hook is unregistered
+    """
+    with patch("core.ai_healer.atexit") as exit_hooks:
+        with AIHealer(
+            log_path=str(tmp_path / "healing_log.json"),
+            cache_path=str(tmp_path / "healing_cache.json")
+        ) as healer:
+            with patch.object(healer.ai, 'ask', return_value='#healed'):
+                healer.heal_locator(mock_page, "#old", "Test", "Playwright")
+    
+    exit_hooks.unregister.assert_called_once_with(healer.flush)
+    assert healer._log_file is None
+    with open(healer.cache_path, 'r') as f:
+        assert len(json.load(f)) == 1
+    with open(healer.log_path, 'r') as f:
+        assert len(f.read().splitlines()) == 1
+    
+    print("✅ Test passed: close() flushes and unregisters the exit hook")
+
+
+def test_cache_save_is_atomic(temp_healer, mock_page):
+    """
+    Test that the cache file is replaced whole, never rewritten in place.
+    
+    Expected:
+        - A failed save leaves the previous cache file intact
+        - No temp files are left next to the cache
+    """
+    with patch.object(temp_healer.ai, 'ask', side_effect=['#one', '#two']):
+        temp_healer.heal_locator(mock_page, "#a", "Test", "Playwright")
+        temp_healer.flush()
+        temp_healer.heal_locator(mock_page, "#b", "Test", "Playwright")
+    
+    with patch("core.ai_healer.os.replace", side_effect=OSError("disk full")):
+        temp_healer.flush()
+    
+    cache_path = Path(temp_healer.cache_path)
+    with open(cache_path, 'r') as f:
+        assert len(json.load(f)) == 1
+    assert not list(cache_path.parent.glob("*.tmp"))
+    
+    print("✅ Test passed: Cache saves are atomic")
+
+
 def test_clear_cache(temp_healer, mock_page):
     """
     Test cache clearing.
@@ -426,7 +533,7 @@ def test_clear_cache(temp_healer, mock_page):
     with open(temp_healer.cache_path, 'r') as f:
         cache_data = json.load(f)
     
-    assert cache_data == {}
+    assert cache_data == []
     
     print("✅ Test passed: Cache clearing")
 
@@ -479,6 +586,21 @@ def test_get_healing_stats(temp_healer, mock_page):
     print(f"✅ Test passed: Healing stats = {stats}")
 
 
+def test_healing_stats_include_earlier_runs(temp_healer, mock_page):
+    """Stats count records already in the log plus this healer's own events."""
+    with patch.object(temp_healer.ai, 'ask', return_value='#healed'):
+        temp_healer.heal_locator(mock_page, "#old", "Test", "Playwright")
+    temp_healer.flush()
+    
+    healer = AIHealer(log_path=temp_healer.log_path, cache_path=temp_healer.cache_path)
+    healer.heal_locator(mock_page, "#old", "Test", "Playwright")
+    
+    stats = healer.get_healing_stats()
+    assert stats['total_healings'] == 2
+    assert stats['by_source'] == {"cache": 1, "ai": 1, "fallback": 0}
+    assert healer.get_healing_stats() == stats
+
+
 # ========================================
 # RUN ALL TESTS
 # ========================================
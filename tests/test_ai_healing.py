@@ -7,73 +7,61 @@ This test intentionally breaks a locator and lets the AIHealer fix it.
 """
 
 import pytest
-from playwright.sync_api import sync_playwright
 from core.ai_healer import AIHealer
 
 
-def test_ai_locator_self_healing(tmp_path):
+def test_ai_locator_self_healing(tmp_path, page):
     healer = AIHealer(log_path="logs/healing_log.json")
 
-    with sync_playwright() as p:
-        # Launch browser with SSL bypass for corporate networks
-        browser = p.chromium.launch(
-            headless=True,
-            args=['--ignore-certificate-errors']
-        )
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-
-        # 1️⃣ Go to a simple page
-        print("\n[Test] Creating test page with form elements...")
-        # Use local HTML content with actual form fields
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head><title>Test Page</title></head>
-        <body>
-            <h1>Example Domain</h1>
-            <form>
-                <input type="text" id="firstname" name="firstname" placeholder="First name">
-                <input type="text" id="lastname" name="lastname" placeholder="Last name">
-                <button id="submit-btn">Submit</button>
-            </form>
-        </body>
-        </html>
-        """
-        page.set_content(html_content)
-
-        # 2️⃣ Intentionally use a wrong locator to simulate failure
-        failed_locator = "input#wrong_id"
+    # 1️⃣ Go to a simple page
+    print("\n[Test] Creating test page with form elements...")
+    # Use local HTML content with actual form fields
+    html_content = """
+    <!DOCTYPE html>
+    <html>
+    <head><title>Test Page</title></head>
+    <body>
+        <h1>Example Domain</h1>
+        <form>
+            <input type="text" id="firstname" name="firstname" placeholder="First name">
+            <input type="text" id="lastname" name="lastname" placeholder="Last name">
+            <button id="submit-btn">Submit</button>
+        </form>
+    </body>
+    </html>
+    """
+    page.set_content(html_content)
 
-        try:
-            element = page.locator(failed_locator)
-            element.click(timeout=2000)
-        except Exception as e:
-            print(f"\n[Initial Failure] Locator failed: {failed_locator}")
-            print(f"[Error] {str(e)[:100]}")
-            print("[Triggering AI-Healing...]")
+    # 2️⃣ Intentionally use a wrong locator to simulate failure
+    failed_locator = "input#wrong_id"
 
-            # 3️⃣ Call the AI-Healer
-            healed_locator = healer.heal_locator(
-                page, 
-                failed_locator, 
-                context_hint="Find the first name input field",
-                engine="Playwright"
-            )
+    try:
+        element = page.locator(failed_locator)
+        element.click(timeout=2000)
+    except Exception as e:
+        print(f"\n[Initial Failure] Locator failed: {failed_locator}")
+        print(f"[Error] {str(e)[:100]}")
+        print("[Triggering AI-Healing...]")
 
-            print(f"[AI-Healer] Suggested new locator: {healed_locator}")
+        # 3️⃣ Call the AI-Healer
+        healed_locator = healer.heal_locator(
+            page, 
+            failed_locator, 
+            context_hint="Find the first name input field",
+            engine="Playwright"
+        )
 
-            # 4️⃣ Retry with the healed locator
-            try:
-                element = page.locator(healed_locator)
-                element.fill("John")
-                print("[Healed Interaction] Success! Filled the input with 'John'")
-            except Exception as retry_error:
-                print(f"[Warning] Healed locator also failed: {retry_error}")
-                # Still pass the test if healing logic worked
-                print("[Test] AI healing mechanism executed successfully!")
+        print(f"[AI-Healer] Suggested new locator: {healed_locator}")
 
-        browser.close()
+        # 4️⃣ Retry with the healed locator
+        try:
+            element = page.locator(healed_locator)
+            element.fill("John")
+            print("[Healed Interaction] Success! Filled the input with 'John'")
+        except Exception as retry_error:
+            print(f"[Warning] Healed locator also failed: {retry_error}")
+            # Still pass the test if healing logic worked
+            print("[Test] AI healing mechanism executed successfully!")
 
     # 5️⃣ Display recent healings
     print("\n" + "="*80)
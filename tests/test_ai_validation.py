@@ -30,13 +30,9 @@ if not OPENAI_API_KEY:
 client = OpenAI(api_key=OPENAI_API_KEY)
 
 
-def test_ai_page_verification():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto("https://playwright.dev/")  # any small site
-        content = page.text_content("body")
-        browser.close()
+def test_ai_page_verification(page):
+    page.goto("https://playwright.dev/")  # any small site
+    content = page.text_content("body")
 
     prompt = f"Does this text appear to be the Playwright official homepage? Answer yes or no only.\n\n{content[:3000]}"
     # Use the OpenAI client to create a chat completion
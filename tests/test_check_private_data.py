@@ -0,0 +1,80 @@
+"""
+test_check_private_data.py
+-------------------------------------------------
+Unit tests for the pre-push security scanner:
+  ✅ Secrets past the first scan block
+  ✅ Single-line files longer than a block
+-------------------------------------------------
+"""
+
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.git_hooks import check_private_data as scanner
+
+
+# Built at runtime so this file does not trip the scanner itself
+GROQ_KEY = "gsk_" + "A1b2C3d4" * 7
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Shrink the scan block so multi-block files stay small and fast."""
+    monkeypatch.setattr(scanner, "SCAN_BLOCK_BYTES", 64 * 1024)
+    monkeypatch.setattr(scanner, "SCAN_OVERLAP_BYTES", 512)
+    return scanner.SCAN_BLOCK_BYTES
+
+
+def test_scan_file_finds_secret_past_first_block(tmp_path):
+    """
+    Test that a secret beyond the first SCAN_BLOCK_BYTES is found.
+
+    Expected:
+        - One finding with the line number counted across blocks
+    """
+    line = "const value = 'nothing to see here';\n"
+    lines = scanner.SCAN_BLOCK_BYTES * 5 // (2 * len(line))
+    path = tmp_path / "large.js"
+    path.write_text(line * lines + f"token = {GROQ_KEY}\n")
+    assert path.stat().st_size > 2 * scanner.SCAN_BLOCK_BYTES
+
+    findings = scanner.scan_file(path)
+
+    assert [(name, line_num) for name, line_num, _, _ in findings] == [("Groq API Key", lines + 1)]
+
+
+def test_scan_file_splits_long_line_without_losing_matches(tmp_path, small_blocks):
+    """
+    Test that a minified one-line file is scanned in bounded memory.
+
+    Expected:
+        - Secrets on both sides of every block boundary found exactly once
+        - Peak memory well below the file size
+    """
+    filler = "a=(b,c)=>{d.e(f)};" * (small_blocks // 18)
+    offsets = [small_blocks * n + delta for n in (1, 3, 7) for delta in (-60, -5, 0, 5)]
+    parts, last = [], 0
+    for offset in offsets:
+        parts.append((filler * 16)[last:offset])
+        parts.append(f" {GROQ_KEY} ")
+        last = offset
+    parts.append((filler * 16)[last:])
+    path = tmp_path / "bundle.min.js"
+    path.write_text("".join(parts))
+
+    tracemalloc.start()
+    try:
+        findings = scanner.scan_file(path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert len(findings) == len(offsets)
+    assert {line_num for _, line_num, _, _ in findings} == {1}
+    assert peak < path.stat().st_size // 2
@@ -207,36 +207,6 @@ class TestMultipleLocatorTypes:
         print("="*70 + "\n")
 
 
-# Fixtures for Playwright
-@pytest.fixture
-def page():
-    """Create Playwright page."""
-    from playwright.sync_api import sync_playwright
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        yield page
-        browser.close()
-
-
-# Fixtures for Selenium
-@pytest.fixture
-def driver():
-    """Create Selenium WebDriver."""
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    
-    driver = webdriver.Chrome(options=options)
-    yield driver
-    driver.quit()
-
-
 if __name__ == "__main__":
     # Run with: pytest tests/test_locator_types_demo.py -v -s
     print("""
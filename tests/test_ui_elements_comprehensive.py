@@ -17,11 +17,26 @@ Author: Ram, Senior AI Test Automation Engineer
 """
 
 import pytest
-import time
-from playwright.sync_api import Page, sync_playwright
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from core.smart_locator import SmartLocator, PlaywrightAdapter, SeleniumAdapter
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+
+
+# ========================================
+# WAIT HELPERS (event-driven, no fixed sleeps)
+# ========================================
+
+def wait_visible(page: Page, selector: str, timeout: int = 5000) -> bool:
+    """Wait until selector is visible; False (not an error) on timeout"""
+    try:
+        page.wait_for_selector(selector, state="visible", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def wait_for_paint(page: Page) -> None:
+    """Return after the browser has painted the current DOM (two animation frames)"""
+    page.evaluate("new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
 
 
 # ========================================
@@ -29,13 +44,9 @@ from selenium.webdriver.chrome.options import Options
 # ========================================
 
 @pytest.fixture
-def playwright_page():
-    """Playwright page fixture"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        yield page
-        browser.close()
+def playwright_page(page):
+    """Playwright page fixture (session browser from conftest, fresh context per test)"""
+    return page
 
 
 @pytest.fixture
@@ -45,13 +56,9 @@ def playwright_adapter(playwright_page):
 
 
 @pytest.fixture
-def selenium_driver():
-    """Selenium WebDriver fixture"""
-    options = Options()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=options)
-    yield driver
-    driver.quit()
+def selenium_driver(driver):
+    """Selenium WebDriver fixture (session Chrome from conftest, reset after each test)"""
+    return driver
 
 
 @pytest.fixture
@@ -202,11 +209,11 @@ class TestButtonsAndNavigation:
         # Click different tabs
         origin_tab = SmartLocator("#demo-tab-origin", playwright_adapter, "Origin tab")
         origin_tab.click()
-        time.sleep(0.5)
+        wait_visible(playwright_page, "#demo-tabpane-origin")
         
         use_tab = SmartLocator("#demo-tab-use", playwright_adapter, "Use tab")
         use_tab.click()
-        time.sleep(0.5)
+        wait_visible(playwright_page, "#demo-tabpane-use")
         
         # Verify tab panel content
         use_panel = SmartLocator("#demo-tabpane-use", playwright_adapter, "Use tab panel")
@@ -223,7 +230,7 @@ class TestButtonsAndNavigation:
         main_item_2.hover()
         
         # Wait for submenu
-        time.sleep(0.5)
+        wait_visible(playwright_page, "a:has-text('Sub Item')")
         
         # Click submenu item
         sub_item = SmartLocator("a:has-text('Sub Item')", playwright_adapter, "Sub Item")
@@ -284,9 +291,8 @@ class TestContainersAndLayout:
         
         # Set up alert handler
         playwright_page.once("dialog", lambda dialog: dialog.accept())
-        alert_btn.click()
-        
-        time.sleep(0.5)
+        with playwright_page.expect_event("dialog"):
+            alert_btn.click()
         
         # Timer alert
         timer_alert_btn = SmartLocator("#timerAlertButton", playwright_adapter, "Timer alert button")
@@ -311,7 +317,7 @@ class TestContainersAndLayout:
         section_2 = SmartLocator("#section2Heading", playwright_adapter, "Section 2 heading")
         section_2.click()
         
-        time.sleep(0.5)
+        wait_visible(playwright_page, "#section2Content")
         
         # Verify content visible
         content_2 = SmartLocator("#section2Content", playwright_adapter, "Section 2 content")
@@ -402,7 +408,7 @@ class TestDataDisplay:
         item_3 = SmartLocator(".list-group-item:nth-child(3)", playwright_adapter, "Third item")
         
         item_1.drag_to(item_3.get_current_locator())
-        time.sleep(1)
+        wait_for_paint(playwright_page)
         
         print("✅ Sortable list tested successfully (Playwright)")
 
@@ -422,7 +428,7 @@ class TestDynamicUI:
         multi_input = SmartLocator(".auto-complete__input input", playwright_adapter, "Multi-select input")
         multi_input.fill("Bl")
         
-        time.sleep(1)
+        wait_visible(playwright_page, ".auto-complete__option")
         
         # Select first option
         option = SmartLocator(".auto-complete__option:first-child", playwright_adapter, "First option")
@@ -431,7 +437,7 @@ class TestDynamicUI:
         
         # Type another value
         multi_input.fill("Re")
-        time.sleep(1)
+        wait_visible(playwright_page, ".auto-complete__option")
         
         option = SmartLocator(".auto-complete__option:first-child", playwright_adapter, "First option")
         if option.is_visible():
@@ -482,7 +488,9 @@ class TestDynamicUI:
         start_btn.click()
         
         # Wait for progress
-        time.sleep(2)
+        playwright_page.wait_for_function(
+            "Number(document.querySelector('.progress-bar').getAttribute('aria-valuenow')) >= 10"
+        )
         
         # Stop progress
         start_btn.click()
@@ -503,7 +511,7 @@ class TestDynamicUI:
         hover_btn.hover()
         
         # Wait for tooltip
-        time.sleep(1)
+        wait_visible(playwright_page, ".tooltip-inner")
         
         # Verify tooltip appeared
         tooltip = SmartLocator(".tooltip-inner", playwright_adapter, "Tooltip")
@@ -547,7 +555,7 @@ class TestAdvancedInteractions:
         source.drag_to(target.get_current_locator())
         
         # Verify drop
-        time.sleep(1)
+        wait_visible(playwright_page, "#droppable:has-text('Dropped!')")
         dropped_text = target.text()
         assert "Dropped!" in dropped_text
         
@@ -581,7 +589,7 @@ class TestAdvancedInteractions:
         footer = SmartLocator("footer", playwright_adapter, "Footer")
         footer.scroll_into_view()
         
-        time.sleep(1)
+        wait_for_paint(playwright_page)
         
         # Scroll back to top
         header = SmartLocator("header", playwright_adapter, "Header")
@@ -619,8 +627,8 @@ class TestWaitAndVisibility:
         # Element that becomes enabled after 5 seconds
         enable_btn = SmartLocator("#enableAfter", playwright_adapter, "Enable after 5 sec")
         
-        # Wait a bit
-        time.sleep(6)
+        # Wait until the button is enabled (up to 10s)
+        playwright_page.wait_for_selector("#enableAfter:enabled", timeout=10000)
         
         # Check if enabled
         is_enabled = enable_btn.is_enabled()
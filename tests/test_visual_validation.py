@@ -105,7 +105,8 @@ def test_visual_diff_detection(temp_vision_analyzer, sample_images):
     assert diff["diff_pixels"] > 0, "Should detect pixel differences"
     assert "diff_map_path" in diff
     assert diff["diff_map_path"] is not None
-    assert os.path.exists(diff["diff_map_path"]), "Diff map should be saved"
+    assert temp_vision_analyzer.wait_for_diff_map(diff["diff_map_path"]), "Diff map should be saved"
+    assert os.path.exists(diff["diff_map_path"])
     
     print(f"✅ Visual diff detected: {diff['similarity']:.4f} similarity, {diff['diff_percentage']:.2f}% changed")
 
@@ -129,6 +130,141 @@ def test_visual_diff_identical_images(temp_vision_analyzer, identical_images):
     print(f"✅ Identical images: {diff['similarity']:.4f} similarity")
 
 
+def test_visual_diff_cv2_backend_matches_pillow(tmp_path, sample_images):
+    """
+    Test that the OpenCV backend reports the same diff as Pillow.
+    
+    Expected:
+        - Same similarity and diff_pixels from both backends
+    """
+    pytest.importorskip("cv2")
+    baseline_path, current_path = sample_images
+    
+    pillow = VisionAnalyzer(cache_dir=str(tmp_path / "pil"), ai_gateway=Mock())
+    opencv = VisionAnalyzer(cache_dir=str(tmp_path / "cv2"), ai_gateway=Mock(), image_backend="cv2")
+    
+    diff_pil = pillow.compare_images(baseline_path, current_path, save_diff=False)
+    diff_cv2 = opencv.compare_images(baseline_path, current_path, save_diff=False)
+    
+    assert diff_cv2["similarity"] == diff_pil["similarity"]
+    assert diff_cv2["diff_pixels"] == diff_pil["diff_pixels"]
+
+
+def test_fused_diff_matches_region_detection(temp_vision_analyzer, sample_images):
+    """
+    Test that the fused diff/bbox pass agrees with _detect_changed_regions.
+    
+    Expected:
+        - Same bounding box and non-zero channel count as the diff array
+    """
+    from core.vision_analyzer import REGION_THRESHOLD, _bbox_regions, _diff_and_bbox
+    
+    baseline_path, current_path = sample_images
+    baseline = np.asarray(Image.open(baseline_path).convert('RGB'))
+    current = np.asarray(Image.open(current_path).convert('RGB'))
+    diff_array = np.abs(baseline.astype(np.int16) - current.astype(np.int16)).astype(np.uint8)
+    
+    diff_pixels, changed_pixels, rmin, rmax, cmin, cmax = _diff_and_bbox(baseline, current, REGION_THRESHOLD)
+    
+    assert diff_pixels == np.count_nonzero(diff_array)
+    with patch("core.vision_analyzer.cv2", None):  # single-box fallback
+        regions = temp_vision_analyzer._detect_changed_regions(diff_array)
+    assert _bbox_regions(rmin, rmax, cmin, cmax, changed_pixels) == regions
+
+
+def test_compare_images_reuses_result_until_file_changes(temp_vision_analyzer, sample_images):
+    """
+    Test that repeat comparisons are served from the result cache.
+    
+    Expected:
+        - Same pair returns the same diff map without re-decoding
+        - Rewriting the current image invalidates the cached result
+    """
+    baseline_path, current_path = sample_images
+    
+    first = temp_vision_analyzer.compare_images(baseline_path, current_path)
+    with patch("core.vision_analyzer._decode_image") as decode:
+        second = temp_vision_analyzer.compare_images(baseline_path, current_path)
+        decode.assert_not_called()
+    assert second == first
+    
+    # Overwrite current with the baseline -> must be recomputed
+    Image.open(baseline_path).save(current_path)
+    os.utime(current_path, ns=(0, 0))
+    third = temp_vision_analyzer.compare_images(baseline_path, current_path)
+    assert third["diff_pixels"] == 0
+
+
+def test_compare_images_reuses_result_for_identical_content(temp_vision_analyzer, sample_images, tmp_path):
+    """Re-captured screenshots with the same bytes hit the cache by content digest."""
+    baseline_path, current_path = sample_images
+    first = temp_vision_analyzer.compare_images(baseline_path, current_path, save_diff=False)
+    
+    recaptured = [str(tmp_path / "baseline_copy.png"), str(tmp_path / "current_copy.png")]
+    for src, dst in zip((baseline_path, current_path), recaptured):
+        Path(dst).write_bytes(Path(src).read_bytes())
+    
+    with patch("core.vision_analyzer._decode_image") as decode:
+        second = temp_vision_analyzer.compare_images(*recaptured, save_diff=False)
+        decode.assert_not_called()
+    assert second == first
+
+
+def test_changed_regions_split_by_component(temp_vision_analyzer):
+    """
+    Test that separate changed areas get separate regions with OpenCV.
+    
+    Expected:
+        - Two disjoint blobs -> two regions, largest first
+    """
+    pytest.importorskip("cv2")
+    diff_array = np.zeros((100, 100, 3), dtype=np.uint8)
+    diff_array[10:20, 10:20] = 255   # 100 px
+    diff_array[60:90, 50:80] = 255   # 900 px
+    
+    regions = temp_vision_analyzer._detect_changed_regions(diff_array)
+    
+    assert [(r["x"], r["y"], r["width"], r["height"], r["area"]) for r in regions] == [
+        (50, 60, 30, 30, 900),
+        (10, 10, 10, 10, 100),
+    ]
+
+
+def test_changed_region_schema_without_cv2(temp_vision_analyzer):
+    """
+    Test the single-box fallback region schema.
+    
+    Expected:
+        - Inclusive width/height (cols 100..399 -> width 300)
+        - Integer "area" = changed pixel count
+    """
+    diff_array = np.zeros((200, 500, 3), dtype=np.uint8)
+    diff_array[50:130, 100:400] = 255
+    
+    with patch("core.vision_analyzer.cv2", None):
+        regions = temp_vision_analyzer._detect_changed_regions(diff_array)
+    
+    assert regions == [{"x": 100, "y": 50, "width": 300, "height": 80, "area": 24000}]
+
+
+def test_changed_region_schema_matches_across_backends(temp_vision_analyzer):
+    """
+    Test that OpenCV and the fallback describe one changed area identically.
+    
+    Expected:
+        - Same x, y, width, height and integer area from both paths
+    """
+    pytest.importorskip("cv2")
+    diff_array = np.zeros((200, 500, 3), dtype=np.uint8)
+    diff_array[50:130, 100:400] = 255
+    
+    with_cv2 = temp_vision_analyzer._detect_changed_regions(diff_array)
+    with patch("core.vision_analyzer.cv2", None):
+        without_cv2 = temp_vision_analyzer._detect_changed_regions(diff_array)
+    
+    assert with_cv2 == without_cv2
+
+
 # ========================================
 # TEST 2: DETECT VISUAL ANOMALIES
 # ========================================
@@ -182,6 +318,54 @@ def test_detect_visual_anomalies_no_differences(temp_vision_analyzer, identical_
     print(f"✅ No anomalies detected for identical images")
 
 
+def test_detect_visual_anomalies_single_pass(temp_vision_analyzer, sample_images, identical_images):
+    """
+    Test that anomaly detection diffs each pair once and maps only anomalies.
+    
+    Expected:
+        - One pixel pass for an anomalous pair, with its diff map saved
+        - No diff map for a pair above the threshold
+    """
+    with patch.object(
+        VisionAnalyzer, "_analyze_arrays", autospec=True, side_effect=VisionAnalyzer._analyze_arrays
+    ) as full_pass:
+        anomalies = temp_vision_analyzer.detect_visual_anomalies(*sample_images, threshold=0.99)
+        assert full_pass.call_count == 1
+        
+        assert temp_vision_analyzer.detect_visual_anomalies(*identical_images, threshold=0.99) == []
+        assert full_pass.call_count == 2
+    
+    assert anomalies
+    diff_maps = {anomaly["diff_map_path"] for anomaly in anomalies}
+    assert len(diff_maps) == 1
+    assert temp_vision_analyzer.wait_for_diff_map(diff_maps.pop())
+    assert len(list(temp_vision_analyzer.cache_dir.glob("diff_*.png"))) == 1
+
+
+def test_detect_visual_anomalies_small_inverted_box(temp_vision_analyzer, tmp_path):
+    """
+    Test that a 100x100 inverted box on a large busy screenshot is reported.
+    
+    Expected:
+        - Similarity ~0.9905 fails a 0.995 threshold although the average
+          colour of the noisy pair barely changes
+    """
+    baseline = np.random.default_rng(7).integers(0, 256, (1024, 1024, 3), dtype=np.uint8)
+    current = baseline.copy()
+    current[200:300, 200:300] = 255 - current[200:300, 200:300]
+    baseline_path = tmp_path / "noise_baseline.png"
+    current_path = tmp_path / "noise_current.png"
+    Image.fromarray(baseline).save(baseline_path)
+    Image.fromarray(current).save(current_path)
+    
+    anomalies = temp_vision_analyzer.detect_visual_anomalies(
+        str(baseline_path), str(current_path), threshold=0.995
+    )
+    
+    assert anomalies
+    assert 0.009 <= anomalies[0]["confidence"] <= 0.01
+
+
 # ========================================
 # TEST 3: LLM VISUAL ANALYSIS
 # ========================================
@@ -328,8 +512,9 @@ def test_visual_fallback_healing_integration(tmp_path, sample_images):
     with patch.object(healer.ai, 'ask', return_value="#failed-locator"):
         # Mock vision analyzer to return a locator
         if healer.vision_analyzer:
+            # VisionAnalyzer uses __slots__, so patch the method on the class
             with patch.object(
-                healer.vision_analyzer,
+                type(healer.vision_analyzer),
                 'suggest_locator_from_visuals',
                 return_value="button[type='submit']"
             ):
@@ -430,6 +615,43 @@ def test_vision_clear_cache(temp_vision_analyzer, sample_images):
     print(f"✅ Cache cleared successfully")
 
 
+def test_vision_cache_persists_as_jsonl(tmp_path, sample_images):
+    """
+    Test that cached analyses survive a reload and legacy JSON is migrated.
+    
+    Expected:
+        - New analyzer instance sees the appended entries
+        - Old vision_cache.json is loaded into the JSONL log
+    """
+    cache_dir = tmp_path / "vision_cache"
+    mock_ai = Mock()
+    mock_ai.ask_vision = Mock(return_value="Button moved")
+    baseline_path, _ = sample_images
+    
+    analyzer = VisionAnalyzer(cache_dir=str(cache_dir), ai_gateway=mock_ai)
+    analyzer.analyze_with_llm(baseline_path, "What changed?")
+    analyzer.analyze_with_llm(baseline_path, "Anything else?")
+    
+    reloaded = VisionAnalyzer(cache_dir=str(cache_dir), ai_gateway=mock_ai)
+    assert reloaded.cache == analyzer.cache
+    assert len(reloaded.cache) == 2
+    
+    # Legacy pretty-printed cache is migrated on load
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    with open(legacy_dir / "vision_cache.json", 'w') as f:
+        json.dump({"abc": {"description": "old"}}, f, indent=2)
+    
+    migrated = VisionAnalyzer(cache_dir=str(legacy_dir), ai_gateway=mock_ai)
+    assert migrated.cache == {"abc": {"description": "old"}}
+    assert (legacy_dir / "vision_cache.jsonl").exists()
+    
+    # Full rewrites go through a temp file that is swapped in
+    migrated.compact()
+    assert not (legacy_dir / "vision_cache.jsonl.tmp").exists()
+    assert VisionAnalyzer(cache_dir=str(legacy_dir), ai_gateway=mock_ai).cache == migrated.cache
+
+
 # ========================================
 # RUN TESTS
 # ========================================
@@ -24,7 +24,8 @@ from io import BytesIO
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from core.vision_analyzer import VisionAnalyzer
 
@@ -37,7 +38,8 @@ st.set_page_config(
 )
 
 # Paths
-CACHE_PATH = project_root / "logs" / "vision_cache.json"
+CACHE_PATH = project_root / "logs" / "vision_cache.jsonl"
+LEGACY_CACHE_PATH = project_root / "logs" / "vision_cache.json"
 HEALING_LOG_PATH = project_root / "logs" / "healing_log.json"
 REPORTS_DIR = project_root / "reports"
 
@@ -56,10 +58,20 @@ if 'healing_logs' not in st.session_state:
 
 
 def load_vision_cache():
-    """Load cached vision analysis runs."""
+    """Load cached vision analysis runs (JSONL log, last record per key wins)."""
     if CACHE_PATH.exists():
-        with open(CACHE_PATH, 'r') as f:
-            return json.load(f)
+        cache_data = {}
+        # One read for the whole file, then parse line by line in memory
+        for line in CACHE_PATH.read_bytes().splitlines():
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                cache_data[record["k"]] = record["v"]
+        return cache_data
+    if LEGACY_CACHE_PATH.exists():
+        return json.loads(LEGACY_CACHE_PATH.read_bytes())
     return {}
 
 
@@ -377,7 +389,7 @@ def render_compare_images(provider, threshold):
                     
                     with col_diff:
                         st.markdown("**Diff Map**")
-                        if diff_result.get('diff_map_path') and Path(diff_result['diff_map_path']).exists():
+                        if st.session_state.vision_analyzer.wait_for_diff_map(diff_result.get('diff_map_path')):
                             diff_img = Image.open(diff_result['diff_map_path'])
                             st.image(diff_img, use_container_width=True)
                 